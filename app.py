@@ -1,4 +1,4 @@
-from flask import Flask # type: ignore
+from flask import Flask, jsonify # type: ignore
 from config import MONGO_URI
 from routes.revenue_routes import create_revenue_blueprint
 from routes.review_routes import create_review_blueprint 
@@ -11,6 +11,10 @@ from flask_cors import CORS # type: ignore
 from apscheduler.schedulers.background import BackgroundScheduler # type: ignore
 from scheduler.review_scraper_scheduler import run_scraping_for_all_hotels
 from models.scrape_log import ScrapeLog
+from models.base_db import client_metrics, get_database
+from models.indexes import schedule_index_check
+from scheduler.ingest_worker import start_ingest_workers
+from config import INGEST_WORKER_THREADS, VERIFY_INDEXES_ON_STARTUP
 import os
 port = int(os.environ.get("PORT", 8000))
 
@@ -40,10 +44,24 @@ app.register_blueprint(user_bp)
 scrape_log_bp = create_scrape_log_blueprint(app)
 app.register_blueprint(scrape_log_bp)
 
+@app.before_request
+def ensure_ingest_workers():
+    if INGEST_WORKER_THREADS > 0:
+        start_ingest_workers(app)
+
+@app.before_request
+def verify_indexes():
+    if VERIFY_INDEXES_ON_STARTUP:
+        schedule_index_check(get_database())
+
 @app.route("/ping")
 def ping():
     return "pong"
 
+@app.route("/metrics/db")
+def db_metrics():
+    return jsonify(client_metrics())
+
 if __name__ == "__main__":
     scheduler = BackgroundScheduler()
     scheduler.add_job(
@@ -1,4 +1,51 @@
 import os
 
 MONGO_URI = os.environ.get("MONGO_URI")
-SECRET_KEY = os.environ.get("SECRET_KEY")
\ No newline at end of file
+SECRET_KEY = os.environ.get("SECRET_KEY")
+
+REVIEW_INGEST_BATCH_SIZE = int(os.environ.get("REVIEW_INGEST_BATCH_SIZE", 500))
+REVIEW_INGEST_MAX_BATCH_SIZE = int(os.environ.get("REVIEW_INGEST_MAX_BATCH_SIZE", 5000))
+LANGUAGE_CACHE_SIZE = int(os.environ.get("LANGUAGE_CACHE_SIZE", 10000))
+
+REVIEW_PARALLEL_ENABLED = os.environ.get("REVIEW_PARALLEL_ENABLED", "false").lower() == "true"
+REVIEW_PARALLEL_THRESHOLD = int(os.environ.get("REVIEW_PARALLEL_THRESHOLD", 400))
+REVIEW_PARALLEL_CHUNK_SIZE = int(os.environ.get("REVIEW_PARALLEL_CHUNK_SIZE", 250))
+REVIEW_PARALLEL_WORKERS = int(os.environ.get("REVIEW_PARALLEL_WORKERS", os.cpu_count() or 2))
+
+INGEST_WORKER_THREADS = int(os.environ.get("INGEST_WORKER_THREADS", 1))
+INGEST_POLL_INTERVAL = float(os.environ.get("INGEST_POLL_INTERVAL", 2))
+INGEST_LEASE_SECONDS = int(os.environ.get("INGEST_LEASE_SECONDS", 300))
+INGEST_MAX_ATTEMPTS = int(os.environ.get("INGEST_MAX_ATTEMPTS", 3))
+
+MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME", "hotelPerformance")
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 20))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", 5000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 10000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", 0)) or None
+MONGO_READ_PREFERENCE = os.environ.get("MONGO_READ_PREFERENCE", "primary")
+
+VERIFY_INDEXES_ON_STARTUP = os.environ.get("VERIFY_INDEXES_ON_STARTUP", "true").lower() == "true"
+
+DIAGRAM_CACHE_BACKEND = os.environ.get("DIAGRAM_CACHE_BACKEND", "memory")
+DIAGRAM_CACHE_SIZE = int(os.environ.get("DIAGRAM_CACHE_SIZE", 256))
+DIAGRAM_CACHE_TTL = int(os.environ.get("DIAGRAM_CACHE_TTL", 3600))
+DIAGRAM_MAX_BUCKETS = int(os.environ.get("DIAGRAM_MAX_BUCKETS", 1000))
+
+REVENUE_IMPORT_BATCH_SIZE = int(os.environ.get("REVENUE_IMPORT_BATCH_SIZE", 1000))
+
+REVENUE_RATE_TABLE = os.environ.get(
+    "REVENUE_RATE_TABLE",
+    '[{"effective_from": "01-01-1970", "service_charge": 0.10, "government_tax": 0.11}]'
+)
+REVENUE_RECOMPUTE_BATCH_SIZE = int(os.environ.get("REVENUE_RECOMPUTE_BATCH_SIZE", 5000))
+
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+
+KPI_MAX_DAYS = int(os.environ.get("KPI_MAX_DAYS", 731))
+
+REVENUE_PATCH_MAX_BATCH = int(os.environ.get("REVENUE_PATCH_MAX_BATCH", 500))
+
+HOTEL_AUTOCOMPLETE_LIMIT = int(os.environ.get("HOTEL_AUTOCOMPLETE_LIMIT", 10))
+HOTEL_AUTOCOMPLETE_CANDIDATES = int(os.environ.get("HOTEL_AUTOCOMPLETE_CANDIDATES", 50))
+HOTEL_UPDATE_RETRIES = int(os.environ.get("HOTEL_UPDATE_RETRIES", 3))
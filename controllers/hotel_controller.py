@@ -1,6 +1,9 @@
-import re
 from flask import request, jsonify # type: ignore
-from bson import ObjectId, regex # type: ignore
+from bson import ObjectId # type: ignore
+from config import HOTEL_AUTOCOMPLETE_LIMIT, HOTEL_AUTOCOMPLETE_CANDIDATES, HOTEL_UPDATE_RETRIES
+from utils.cache import VersionCounters
+from utils.text_search import (HOTEL_SEARCH_FIELDS, hotel_search_prefixes, prefix_search_query,
+                               prefix_rank_expression)
 
 class HotelController:
     def __init__(self, db):
@@ -17,41 +20,71 @@ class HotelController:
         data.setdefault("traveloka_link", "")
         data.setdefault("tripcom_link", "")
         data.setdefault("ticketcom_link", "")
+        data["search_prefixes"] = hotel_search_prefixes(data)
 
         hotel_id = self.db.collection.insert_one(data).inserted_id
         return jsonify({"message": "Hotel created", "id": str(hotel_id)}), 201
 
     def get_hotels(self):
-        search_term = request.args.get("q")
+        search_term = (request.args.get("q") or "").strip()
         page = int(request.args.get("page", 1))
         limit = int(request.args.get("limit", 15))
         skip = (page - 1) * limit
 
-        query = {}
-        if search_term:
-            query = {
-                "$or": [
-                    {"hotel_name": {"$regex": re.escape(search_term), "$options": "i"}},
-                    {"city": {"$regex": re.escape(search_term), "$options": "i"}},
-                    {"country": {"$regex": re.escape(search_term), "$options": "i"}},
-                    {"address": {"$regex": re.escape(search_term), "$options": "i"}}
-                ]
+        query = prefix_search_query(search_term) if search_term else {}
+        if query is None:
+            return jsonify({"data": [], "total": 0, "page": page, "limit": limit})
+
+        facet = next(self.db.collection.aggregate([
+            {"$match": query},
+            {
+                "$facet": {
+                    "data": [{"$skip": skip}, {"$limit": limit}, {"$project": {"search_prefixes": 0}}],
+                    "total": [{"$count": "count"}]
+                }
             }
+        ]), {})
 
         hotels = []
-        cursor = self.db.collection.find(query).skip(skip).limit(limit)
-        total_count = self.db.collection.count_documents(query)
-
-        for hotel in cursor:
+        for hotel in facet.get("data", []):
             hotel["_id"] = str(hotel["_id"])
             hotels.append(hotel)
 
         return jsonify({
             "data": hotels,
-            "total": total_count,
+            "total": facet["total"][0]["count"] if facet.get("total") else 0,
             "page": page,
             "limit": limit
         })
+
+    def autocomplete_hotels(self):
+        search_term = request.args.get("q", "")
+        limit = min(request.args.get("limit", HOTEL_AUTOCOMPLETE_LIMIT, type=int), HOTEL_AUTOCOMPLETE_CANDIDATES)
+
+        query = prefix_search_query(search_term)
+        if not query:
+            return jsonify({"data": []})
+
+        candidates = self.db.collection.aggregate([
+            {"$match": query},
+            {"$project": {"hotel_name": 1, "city": 1, "country": 1}},
+            {"$addFields": {
+                "rank": prefix_rank_expression(search_term),
+                "name_length": {"$strLenCP": {"$ifNull": ["$hotel_name", ""]}}
+            }},
+            {"$sort": {"rank": 1, "name_length": 1, "hotel_name": 1, "_id": 1}},
+            {"$limit": limit}
+        ])
+
+        return jsonify({"data": [
+            {
+                "_id": str(hotel["_id"]),
+                "hotel_name": hotel.get("hotel_name", ""),
+                "city": hotel.get("city", ""),
+                "country": hotel.get("country", "")
+            }
+            for hotel in candidates
+        ]})
         
     def get_hotels_dropdown(self):
         hotels = []
@@ -63,19 +96,39 @@ class HotelController:
         return jsonify(hotels)
 
     def update_hotel(self, hotel_id):
-        data = request.json
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        data.pop("_id", None)
+        data.pop("search_prefixes", None)
+        if not data:
+            return jsonify({"error": "No fields to update"}), 400
+
         try:
-            result = self.db.collection.update_one(
-                {"_id": ObjectId(hotel_id)},
-                {"$set": data}
-            )
+            hotel_obj_id = ObjectId(hotel_id)
         except Exception:
             return jsonify({"error": "Invalid hotel ID"}), 400
 
-        if result.matched_count == 0:
-            return jsonify({"error": "Hotel not found"}), 404
+        if not any(field in data for field in HOTEL_SEARCH_FIELDS):
+            result = self.db.collection.update_one({"_id": hotel_obj_id}, {"$set": data})
+            if not result.matched_count:
+                return jsonify({"error": "Hotel not found"}), 404
+            return jsonify({"message": "Hotel updated"}), 200
+
+        for _ in range(HOTEL_UPDATE_RETRIES):
+            hotel = self.db.collection.find_one({"_id": hotel_obj_id}, {field: 1 for field in HOTEL_SEARCH_FIELDS})
+            if not hotel:
+                return jsonify({"error": "Hotel not found"}), 404
+
+            # only write when the search fields are still the ones the prefixes were computed from
+            result = self.db.collection.update_one(
+                {"_id": hotel_obj_id, **{field: hotel.get(field) for field in HOTEL_SEARCH_FIELDS}},
+                {"$set": {**data, "search_prefixes": hotel_search_prefixes({**hotel, **data})}}
+            )
+            if result.matched_count:
+                return jsonify({"message": "Hotel updated"}), 200
 
-        return jsonify({"message": "Hotel updated"}), 200
+        return jsonify({"error": "Hotel was modified concurrently, please retry"}), 409
 
     def delete_hotel(self, hotel_id):
         try:
@@ -90,6 +143,9 @@ class HotelController:
         hotel_result = self.db.collection.delete_one({"_id": hotel_obj_id})
 
         revenue_result = self.db.revenues.delete_many({"hotel_id": hotel_obj_id})
+        for rollups in (self.db.monthly_rollups, self.db.daily_rollups):
+            rollups.update_many({"hotel_id": hotel_obj_id}, {"$unset": {"revenue": ""}})
+        VersionCounters(self.db.cache_versions).bump([hotel_obj_id])
 
         return jsonify({
             "message": "Hotel and associated revenues deleted successfully.",
@@ -0,0 +1,157 @@
+from flask import jsonify  # type: ignore
+from bson import ObjectId  # type: ignore
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument  # type: ignore
+
+REQUIRED_REVIEW_FIELDS = ["username", "comment", "timestamp", "OTA"]
+
+def validate_review(review):
+    if not isinstance(review, dict):
+        return "Review must be an object"
+    missing = [field for field in REQUIRED_REVIEW_FIELDS if field not in review]
+    if missing:
+        return f"Missing field(s): {', '.join(missing)}"
+    return None
+
+class IngestJobController:
+    def __init__(self, db):
+        self.db = db
+
+    def enqueue(self, batches, hotel_id, ota):
+        now = datetime.utcnow()
+        job_id = self.db.collection.insert_one({
+            "hotel_id": hotel_id,
+            "ota": ota,
+            "status": "receiving",
+            "total_reviews": 0,
+            "total_chunks": 0,
+            "processed_chunks": 0,
+            "inserted": 0,
+            "skipped_non_indonesian": 0,
+            "duplicates": 0,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        }).inserted_id
+
+        total_reviews = 0
+        seq = 0
+        try:
+            for seq, batch in enumerate(batches):
+                for position, review in enumerate(batch):
+                    error = validate_review(review)
+                    if error:
+                        raise ValueError(f"Review {total_reviews + position}: {error}")
+                self.db.chunks.insert_one({"job_id": job_id, "seq": seq, "reviews": batch})
+                total_reviews += len(batch)
+            total_chunks = seq + 1 if total_reviews else 0
+        except Exception:
+            self.db.chunks.delete_many({"job_id": job_id})
+            self.db.collection.delete_one({"_id": job_id})
+            raise
+
+        self.db.collection.update_one({"_id": job_id}, {"$set": {
+            "status": "queued" if total_reviews else "done",
+            "total_reviews": total_reviews,
+            "total_chunks": total_chunks,
+            "updated_at": datetime.utcnow(),
+        }})
+        return job_id, total_reviews
+
+    def claim_next_job(self, lease_seconds, max_attempts):
+        now = datetime.utcnow()
+        return self.db.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_until": {"$lt": now}}
+                ],
+                "attempts": {"$lt": max_attempts}
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "started_at": now,
+                    "updated_at": now,
+                    "lease_until": now + timedelta(seconds=lease_seconds),
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def fail_exhausted_job(self, max_attempts):
+        # a worker that died mid-job never gets to fail it, so its expired lease is the last attempt
+        now = datetime.utcnow()
+        return self.db.collection.find_one_and_update(
+            {"status": "running", "lease_until": {"$lt": now}, "attempts": {"$gte": max_attempts}},
+            {
+                "$set": {
+                    "status": "failed",
+                    "error": "Lease expired after the last attempt",
+                    "finished_at": now,
+                    "updated_at": now,
+                },
+                "$unset": {"lease_until": ""}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+
+    def iter_pending_chunks(self, job):
+        return self.db.chunks.find(
+            {"job_id": job["_id"], "seq": {"$gte": job.get("processed_chunks", 0)}}
+        ).sort("seq", 1)
+
+    def record_chunk(self, job_id, seq, result, lease_seconds):
+        now = datetime.utcnow()
+        self.db.collection.update_one({"_id": job_id}, {
+            "$set": {
+                "processed_chunks": seq + 1,
+                "updated_at": now,
+                "lease_until": now + timedelta(seconds=lease_seconds),
+            },
+            "$inc": {
+                "inserted": len(result.get("inserted_ids", [])),
+                "skipped_non_indonesian": result.get("skipped_count", 0),
+                "duplicates": result.get("duplicate_count", 0),
+            }
+        })
+
+    def finish_job(self, job_id, status, error=None):
+        update = {"status": status, "finished_at": datetime.utcnow(), "updated_at": datetime.utcnow()}
+        if error:
+            update["error"] = error
+        job = self.db.collection.find_one_and_update(
+            {"_id": job_id},
+            {"$set": update, "$unset": {"lease_until": ""}},
+            return_document=ReturnDocument.AFTER
+        )
+        if status == "done":
+            self.db.chunks.delete_many({"job_id": job_id})
+        return job
+
+    def release_job(self, job_id, error):
+        self.db.collection.update_one({"_id": job_id}, {
+            "$set": {"status": "queued", "error": error, "updated_at": datetime.utcnow()},
+            "$unset": {"lease_until": ""}
+        })
+
+    def get_ingest_job(self, job_id):
+        try:
+            job = self.db.collection.find_one({"_id": ObjectId(job_id)})
+        except Exception:
+            return jsonify({"error": "Invalid job ID"}), 400
+
+        if not job:
+            return jsonify({"error": "Ingest job not found"}), 404
+
+        total_chunks = job.get("total_chunks", 0)
+        processed_chunks = job.get("processed_chunks", 0)
+
+        job["_id"] = str(job["_id"])
+        job.pop("lease_until", None)
+        job["progress"] = round(processed_chunks / total_chunks * 100, 2) if total_chunks else (
+            100.0 if job["status"] == "done" else 0.0
+        )
+        return jsonify(job), 200
@@ -0,0 +1,183 @@
+from flask import jsonify, request  # type: ignore
+from bson import ObjectId  # type: ignore
+from datetime import datetime, timedelta
+from config import KPI_MAX_DAYS
+
+KPI_WINDOWS = (7, 30)
+KPI_INPUTS = {
+    "room_revenue": "$room_details.total_room_revenue",
+    "rooms_sold": "$room_stats.rooms_sold",
+    "room_available": "$room_stats.room_available",
+    "rooms_occupied": "$room_stats.rooms_occupied"
+}
+KPI_SUFFIXES = [""] + [f"_{window}d" for window in KPI_WINDOWS]
+
+def same_day_last_year(day):
+    try:
+        return day.replace(year=day.year - 1)
+    except ValueError:
+        return day.replace(year=day.year - 1, day=28)
+
+def ratio_expression(numerator, denominator, scale=1):
+    return {
+        "$cond": [
+            {"$gt": [denominator, 0]},
+            {"$round": [{"$multiply": [{"$divide": [numerator, denominator]}, scale]}, 2]},
+            0
+        ]
+    }
+
+def kpi_expressions(suffix=""):
+    return {
+        f"occupancy{suffix}": ratio_expression(f"$rooms_occupied{suffix}", f"$room_available{suffix}", 100),
+        f"adr{suffix}": ratio_expression(f"$room_revenue{suffix}", f"$rooms_sold{suffix}"),
+        f"revpar{suffix}": ratio_expression(f"$room_revenue{suffix}", f"$room_available{suffix}")
+    }
+
+def ratio(numerator, denominator, scale=1):
+    return round(numerator / denominator * scale, 2) if denominator > 0 else 0
+
+def kpi_summary(totals):
+    return {
+        **{key: round(value, 2) for key, value in totals.items()},
+        "occupancy": ratio(totals["rooms_occupied"], totals["room_available"], 100),
+        "adr": ratio(totals["room_revenue"], totals["rooms_sold"]),
+        "revpar": ratio(totals["room_revenue"], totals["room_available"])
+    }
+
+def change_pct(current, previous):
+    return round((current - previous) / previous * 100, 2) if previous else None
+
+def kpi_pipeline(hotel_ids, start, end):
+    match = {"revenue_date": {"$gte": start, "$lte": end}}
+    if hotel_ids:
+        match["hotel_id"] = {"$in": hotel_ids}
+
+    return [
+        {"$match": match},
+        {
+            "$group": {
+                "_id": {"hotel_id": "$hotel_id", "day": "$revenue_date"},
+                **{key: {"$sum": {"$ifNull": [path, 0]}} for key, path in KPI_INPUTS.items()}
+            }
+        },
+        {
+            "$setWindowFields": {
+                "partitionBy": "$_id.hotel_id",
+                "sortBy": {"_id.day": 1},
+                "output": {
+                    f"{key}_{window}d": {
+                        "$sum": f"${key}",
+                        "window": {"range": [-(window - 1), 0], "unit": "day"}
+                    }
+                    for window in KPI_WINDOWS
+                    for key in KPI_INPUTS
+                }
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "hotel_id": "$_id.hotel_id",
+                "day": "$_id.day",
+                **{key: 1 for key in KPI_INPUTS},
+                **{name: expr for suffix in KPI_SUFFIXES for name, expr in kpi_expressions(suffix).items()}
+            }
+        },
+        {"$sort": {"hotel_id": 1, "day": 1}}
+    ]
+
+class KpiController:
+    def __init__(self, db):
+        self.db = db
+
+    def parse_kpi_args(self, args):
+        hotel_ids = []
+        hotel_ids_param = args.get("hotel_id") or args.get("hotel_ids")
+        if hotel_ids_param:
+            for hid in hotel_ids_param.split(","):
+                if not ObjectId.is_valid(hid.strip()):
+                    raise ValueError(f"Invalid hotel ID: {hid.strip()}")
+                hotel_ids.append(ObjectId(hid.strip()))
+
+        try:
+            end = datetime.strptime(args["to"], "%d-%m-%Y") if args.get("to") else \
+                datetime.combine(datetime.today(), datetime.min.time())
+            start = datetime.strptime(args["from"], "%d-%m-%Y") if args.get("from") else end - timedelta(days=364)
+        except ValueError:
+            raise ValueError("from and to must use the dd-mm-yyyy format.")
+
+        if start > end:
+            raise ValueError("from must not be after to.")
+        if (end - start).days + 1 > KPI_MAX_DAYS:
+            raise ValueError(f"Range must not exceed {KPI_MAX_DAYS} days.")
+        return hotel_ids, start, end
+
+    def hotel_kpis(self, rows, start, end):
+        by_day = {row["day"]: row for row in rows}
+        last_year_start, last_year_end = same_day_last_year(start), same_day_last_year(end)
+
+        series = []
+        totals = {key: 0 for key in KPI_INPUTS}
+        last_year_totals = {key: 0 for key in KPI_INPUTS}
+        for row in rows:
+            if last_year_start <= row["day"] <= last_year_end:
+                for key in KPI_INPUTS:
+                    last_year_totals[key] += row[key]
+            if not start <= row["day"] <= end:
+                continue
+
+            for key in KPI_INPUTS:
+                totals[key] += row[key]
+            point = {"date": row["day"].strftime("%d-%m-%Y")}
+            point.update({name: row[name] for suffix in KPI_SUFFIXES for name in kpi_expressions(suffix)})
+
+            last_year = by_day.get(same_day_last_year(row["day"]))
+            point["last_year"] = {
+                name: last_year[name] for suffix in KPI_SUFFIXES for name in kpi_expressions(suffix)
+            } if last_year else None
+            series.append(point)
+
+        current, previous = kpi_summary(totals), kpi_summary(last_year_totals)
+        return {
+            "summary": {
+                "current": current,
+                "last_year": previous,
+                "change_pct": {key: change_pct(current[key], previous[key]) for key in ("occupancy", "adr", "revpar")}
+            },
+            "series": series
+        }
+
+    def get_kpis(self):
+        try:
+            hotel_ids, start, end = self.parse_kpi_args(request.args)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        lookback_start = same_day_last_year(start) - timedelta(days=max(KPI_WINDOWS) - 1)
+        rows_by_hotel = {}
+        for row in self.db.collection.aggregate(kpi_pipeline(hotel_ids, lookback_start, end)):
+            rows_by_hotel.setdefault(row["hotel_id"], []).append(row)
+
+        hotel_names = {
+            hotel["_id"]: hotel.get("hotel_name")
+            for hotel in self.db.hotels.find({"_id": {"$in": list(rows_by_hotel)}}, {"hotel_name": 1})
+        }
+
+        hotels = []
+        for hotel_id in hotel_ids or sorted(rows_by_hotel):
+            hotels.append({
+                "hotel_id": str(hotel_id),
+                "hotel_name": hotel_names.get(hotel_id),
+                **self.hotel_kpis(rows_by_hotel.get(hotel_id, []), start, end)
+            })
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "from": start.strftime("%d-%m-%Y"),
+                "to": end.strftime("%d-%m-%Y"),
+                "windows": list(KPI_WINDOWS),
+                "hotels": hotels
+            }
+        }), 200
@@ -1,29 +1,64 @@
+import csv
 from flask import jsonify, request  # type: ignore
 from bson import ObjectId  # type: ignore
 from datetime import datetime
 from collections import OrderedDict
+from pymongo import UpdateOne, ReturnDocument  # type: ignore
+from pymongo.errors import BulkWriteError, DuplicateKeyError  # type: ignore
+from config import REVENUE_IMPORT_BATCH_SIZE, REVENUE_PATCH_MAX_BATCH, EXPORT_BATCH_SIZE
+from utils.rates import rates_for
+from utils.revenue_engine import FLOAT_INPUTS, STORED_INPUTS, field_value, recompute_update_pipeline
+from utils.pagination import keyset_match, next_cursor
+from utils.streams import (NDJSON_MIMETYPES, CSV_MIMETYPES, EXPORT_FORMATS, iter_ndjson, iter_csv,
+                           iter_batches, export_response)
+from controllers.rollup_controller import REVENUE_COMPONENTS, RollupController
+from models.monthly_rollup import MonthlyRollups
+from models.revenue import parse_revenue_date
+
+REVENUE_EXPORT_COLUMNS = [
+    "_id", "hotel_id", "hotel_name", "date",
+    "room_details.room_lodging", "room_details.rebate_discount", "room_details.total_room_revenue",
+    "restaurant.breakfast", "restaurant.restaurant_food", "restaurant.restaurant_beverage",
+    "restaurant.total_restaurant_revenue",
+    "other_revenue.other_room_revenue", "other_revenue.telephone", "other_revenue.business_center",
+    "other_revenue.other_income", "other_revenue.spa_therapy", "other_revenue.misc",
+    "other_revenue.allowance_other", "other_revenue.total_other_revenue",
+    "nett_revenue", "service_charge", "government_tax", "gross_revenue",
+    "ap_restaurant", "tips", "grand_total_revenue",
+    "room_stats.active_rooms", "room_stats.room_available", "room_stats.house_use",
+    "room_stats.complimentary", "room_stats.rooms_occupied", "room_stats.rooms_sold",
+    "room_stats.vacant_rooms", "room_stats.occupancy", "room_stats.guests_in_house",
+    "room_stats.average_room_rate"
+]
+
+PREVIOUS_FIELD = "_previous"
+# what the rollups and the no-op check read from the pre-image, not the whole document
+PREVIOUS_PATHS = [("hotel_id",), ("date",), ("revenue_date",)] + list(REVENUE_COMPONENTS.values())
+
+def previous_snapshot(paths):
+    snapshot = {}
+    for path in paths:
+        node = snapshot
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = "$" + ".".join(path)
+    return snapshot
+DUPLICATE_REVENUE_MESSAGE = "A revenue record already exists for this hotel and date"
 
 class RevenueController:
     def __init__(self, db):
         self.db = db
+        self.rollups = RollupController(MonthlyRollups())
 
-    def get_revenues(self):
-
-        page = int(request.args.get('page', 1))
-        per_page = int(request.args.get('per_page', 10))
-        skip = (page - 1) * per_page
+    def build_revenue_match(self, args):
+        hotel_ids_param = args.get('hotel_id') or args.get('hotel_ids')
+        min_date = args.get('min_date')
+        max_date = args.get('max_date')
+        min_revenue = args.get('minRevenue')
+        max_revenue = args.get('maxRevenue')
+        min_occupancy = args.get('minOccupancy')
+        max_occupancy = args.get('maxOccupancy')
 
-        hotel_ids_param = request.args.get('hotel_id') or request.args.get('hotel_ids')
-        min_date = request.args.get('min_date')
-        max_date = request.args.get('max_date')
-        sort_by = request.args.get('sort_by', 'date')
-        sort_order = int(request.args.get('sort_order', -1))
-        min_revenue = request.args.get('minRevenue')
-        max_revenue = request.args.get('maxRevenue')
-        min_occupancy = request.args.get('minOccupancy')
-        max_occupancy = request.args.get('maxOccupancy')
-
-        pipeline = []
         match_conditions = []
 
         if hotel_ids_param:
@@ -41,17 +76,7 @@ class RevenueController:
                     date_filter["$gte"] = datetime.strptime(min_date, "%d-%m-%Y")
                 if max_date:
                     date_filter["$lte"] = datetime.strptime(max_date, "%d-%m-%Y")
-                match_conditions.append({
-                    "$expr": {
-                        "$and": [
-                            {"$gte": [{"$dateFromString": {"dateString": "$date", "format"
-                                : "%d-%m-%Y"}}, date_filter.get("$gte", datetime.min)]},
-                            {"$lte": [{"$dateFromString": {"dateString"
-                                : "$date", "format": "%d-%m-%Y"}}
-                                    , date_filter.get("$lte", datetime.max)]}
-                        ]
-                    }
-                })
+                match_conditions.append({"revenue_date": date_filter})
             except Exception:
                 pass
 
@@ -77,9 +102,39 @@ class RevenueController:
         except ValueError:
             pass
 
+        return match_conditions
+
+    def revenue_sort(self, args):
+        sort_by = args.get('sort_by', 'date')
+        sort_order = int(args.get('sort_order', -1))
+        if sort_by == "revenue":
+            return "grand_total_revenue", sort_order
+        if sort_by != "date":
+            sort_order = -1
+        return "revenue_date", sort_order
+
+    def build_revenues_pipeline(self, args):
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', 10))
+        skip = (page - 1) * per_page
+
+        pipeline = []
+        match_conditions = self.build_revenue_match(args)
         if match_conditions:
             pipeline.append({"$match": {"$and": match_conditions}})
 
+        sort_field, sort_order = self.revenue_sort(args)
+
+        cursor_token = args.get('cursor')
+        if cursor_token:
+            pipeline.append({"$match": keyset_match(sort_field, sort_order, cursor_token)})
+
+        pipeline.append({"$sort": {sort_field: sort_order, "_id": sort_order}})
+
+        if not cursor_token:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": per_page + 1})
+
         pipeline += [
             {
                 "$lookup": {
@@ -102,56 +157,31 @@ class RevenueController:
             },
             {
                 "$project": {
-                    "hotel_info": 0
+                    "hotel_info": 0,
+                    PREVIOUS_FIELD: 0
                 }
             }
         ]
 
-        if sort_by == "date":
-            pipeline.append({
-                "$addFields": {
-                    "parsed_date": {
-                        "$dateFromString": {
-                            "dateString": "$date",
-                            "format": "%d-%m-%Y",
-                            "onError": None,
-                            "onNull": None
-                        }
-                    }
-                }
-            })
-            pipeline.append({"$sort": {"parsed_date": sort_order}})
-        elif sort_by == "revenue":
-            pipeline.append({"$sort": {"grand_total_revenue": sort_order}})
-        else:
-            pipeline.append({
-                "$addFields": {
-                    "parsed_date": {
-                        "$dateFromString": {
-                            "dateString": "$date",
-                            "format": "%d-%m-%Y",
-                            "onError": None,
-                            "onNull": None
-                        }
-                    }
-                }
-            })
-            pipeline.append({"$sort": {"parsed_date": -1}})
+        return pipeline, match_conditions, page, per_page, sort_field, sort_order
 
-        pipeline.append({"$skip": skip})
-        pipeline.append({"$limit": per_page})
+    def get_revenues(self):
+        try:
+            pipeline, match_conditions, page, per_page, sort_field, sort_order = self.build_revenues_pipeline(request.args)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
 
         try:
             results = list(self.db.collection.aggregate(pipeline))
+            total = self.db.collection.count_documents({"$and": match_conditions} if match_conditions else {})
+            cursor = next_cursor(results, sort_field, sort_order, per_page)
+            results = results[:per_page]
 
             for item in results:
                 item["_id"] = str(item["_id"])
                 if "hotel_id" in item:
                     item["hotel_id"] = str(item["hotel_id"])
 
-            count_filter = {"$and": match_conditions} if match_conditions else {}
-            total = self.db.collection.count_documents(count_filter)
-
             response = {
                 "success": True,
                 "data": {
@@ -159,6 +189,7 @@ class RevenueController:
                     "per_page": per_page,
                     "total": total,
                     "total_pages": (total + per_page - 1) // per_page,
+                    "next_cursor": cursor,
                     "data": results
                 }
             }
@@ -168,6 +199,36 @@ class RevenueController:
             return jsonify({"success": False, "error": str(e)}), 500
         
     
+    def export_revenues(self):
+        fmt = request.args.get("format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"success": False, "error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+        try:
+            match_conditions = self.build_revenue_match(request.args)
+            sort_field, sort_order = self.revenue_sort(request.args)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        hotel_names = {
+            hotel["_id"]: hotel.get("hotel_name")
+            for hotel in self.db.hotels.find({}, {"hotel_name": 1})
+        }
+        cursor = self.db.collection.find(
+            {"$and": match_conditions} if match_conditions else {},
+            {PREVIOUS_FIELD: 0}
+        ).sort([(sort_field, sort_order), ("_id", sort_order)]).batch_size(EXPORT_BATCH_SIZE)
+
+        def rows():
+            try:
+                for doc in cursor:
+                    doc["hotel_name"] = hotel_names.get(doc.get("hotel_id"))
+                    yield doc
+            finally:
+                cursor.close()
+
+        return export_response(rows(), REVENUE_EXPORT_COLUMNS, fmt, "revenues")
+
     def calculate_revenue(self, data):
         try:
             flat_data = self.normalize_revenue_data(data)
@@ -194,8 +255,9 @@ class RevenueController:
             )
 
             nett_revenue = total_room_revenue + total_restaurant_revenue + total_other_revenue
-            service_charge = nett_revenue * 0.10
-            government_tax = nett_revenue * 0.11
+            service_charge_rate, government_tax_rate = rates_for(flat_data.get("date"))
+            service_charge = nett_revenue * service_charge_rate
+            government_tax = nett_revenue * government_tax_rate
             gross_revenue = nett_revenue + service_charge + government_tax
 
             ap_restaurant = float(flat_data.get("ap_restaurant", 0))
@@ -279,6 +341,150 @@ class RevenueController:
         except Exception:
             return False
 
+    def parse_import_hotel_id(self, row, default_hotel_id=None):
+        hotel_id_raw = row.get("hotel_id") or default_hotel_id
+        if not hotel_id_raw:
+            raise ValueError("hotel_id is required")
+        if isinstance(hotel_id_raw, ObjectId):
+            return hotel_id_raw
+        if isinstance(hotel_id_raw, dict):
+            hotel_id_raw = hotel_id_raw.get("$oid")
+        if not ObjectId.is_valid(hotel_id_raw):
+            raise ValueError("Invalid hotel ID")
+        return ObjectId(hotel_id_raw)
+
+    def prepare_import_row(self, row, default_hotel_id, known_hotels):
+        if not isinstance(row, dict):
+            raise ValueError("Row must be an object")
+
+        hotel_id = self.parse_import_hotel_id(row, default_hotel_id)
+        if hotel_id not in known_hotels:
+            raise ValueError("Hotel ID not found")
+
+        date = row.get("date")
+        try:
+            datetime.strptime(date or "", "%d-%m-%Y")
+        except ValueError:
+            raise ValueError("date is required in dd-mm-yyyy format")
+
+        processed = self.calculate_revenue({k: v for k, v in row.items() if k not in ("_id", "hotel_id")})
+        processed["hotel_id"] = hotel_id
+        processed["date"] = date
+        processed["revenue_date"] = parse_revenue_date(date)
+        return processed
+
+    def import_batch(self, batch, default_hotel_id, summary):
+        hotel_ids = set()
+        for _, row in batch:
+            try:
+                hotel_ids.add(self.parse_import_hotel_id(row, default_hotel_id))
+            except (ValueError, AttributeError, TypeError):
+                pass
+        known_hotels = {doc["_id"] for doc in self.db.hotels.find({"_id": {"$in": list(hotel_ids)}}, {"_id": 1})}
+
+        prepared = {}
+        for row_number, row in batch:
+            try:
+                processed = self.prepare_import_row(row, default_hotel_id, known_hotels)
+            except (ValueError, AttributeError, TypeError) as e:
+                summary["errors"].append({"row": row_number, "error": str(e)})
+                continue
+
+            key = (processed["hotel_id"], processed["date"])
+            if key in prepared:
+                summary["errors"].append({
+                    "row": prepared[key][0],
+                    "error": f"Superseded by row {row_number} for the same hotel and date"
+                })
+            prepared[key] = (row_number, processed)
+
+        if not prepared:
+            return
+
+        existing = {
+            (doc["hotel_id"], doc["date"]): doc
+            for doc in self.db.collection.find({
+                "hotel_id": {"$in": list({hotel_id for hotel_id, _ in prepared})},
+                "date": {"$in": list({date for _, date in prepared})}
+            })
+            if (doc["hotel_id"], doc.get("date")) in prepared
+        }
+
+        keys = list(prepared)
+        ops = [
+            UpdateOne({"hotel_id": hotel_id, "date": date}, {"$set": prepared[(hotel_id, date)][1]}, upsert=True)
+            for hotel_id, date in keys
+        ]
+
+        failed = set()
+        try:
+            result = self.db.collection.bulk_write(ops, ordered=False).bulk_api_result
+        except BulkWriteError as e:
+            result = e.details
+            for error in result.get("writeErrors", []):
+                failed.add(error["index"])
+                summary["errors"].append({"row": prepared[keys[error["index"]]][0], "error": error.get("errmsg")})
+
+        summary["inserted"] += result.get("nUpserted", 0)
+        summary["updated"] += result.get("nMatched", 0)
+
+        self.rollups.apply_revenue_changes([
+            (existing.get(key), prepared[key][1])
+            for i, key in enumerate(keys) if i not in failed
+        ])
+
+    def import_revenues(self, rows, default_hotel_id=None, batch_size=REVENUE_IMPORT_BATCH_SIZE):
+        summary = {"received": 0, "inserted": 0, "updated": 0, "errors": []}
+        read = 0
+
+        def numbered_rows():
+            nonlocal read
+            for row_number, row in enumerate(rows, start=1):
+                read = row_number
+                yield row_number, row
+
+        try:
+            for batch in iter_batches(numbered_rows(), batch_size):
+                summary["received"] += len(batch)
+                self.import_batch(batch, default_hotel_id, summary)
+        except (ValueError, csv.Error) as e:
+            # batches before the malformed row are already written; report where the import stopped
+            summary["aborted"] = {"row": read + 1, "error": str(e), "uncommitted_rows": read - summary["received"]}
+
+        summary["errors"].sort(key=lambda error: error["row"])
+        return summary
+
+    def bulk_import_revenues(self):
+        default_hotel_id = request.args.get("hotel_id")
+
+        if request.mimetype in CSV_MIMETYPES:
+            rows = iter_csv(request.stream)
+        elif request.mimetype in NDJSON_MIMETYPES:
+            rows = iter_ndjson(request.stream)
+        elif request.is_json and isinstance(request.json, list):
+            rows = request.json
+        else:
+            return jsonify({
+                "success": False,
+                "message": "Send text/csv, application/x-ndjson or a JSON array of revenue rows"
+            }), 415
+
+        summary = self.import_revenues(rows, default_hotel_id)
+        if "aborted" in summary:
+            aborted = summary["aborted"]
+            return jsonify({
+                "success": False,
+                "message": f"Malformed import body at row {aborted['row']}: {aborted['error']}. "
+                           f"The first {summary['received']} rows were committed.",
+                "data": summary
+            }), 400
+
+        return jsonify({
+            "success": not summary["errors"],
+            "message": "Revenue import finished",
+            "data": summary
+        }), 200
+
     def create_revenue(self):
         revenue_data = request.json
 
@@ -296,8 +502,13 @@ class RevenueController:
 
             if "date" in revenue_data:
                 processed["date"] = revenue_data["date"]
+                processed["revenue_date"] = parse_revenue_date(revenue_data["date"])
 
-            inserted = self.db.collection.insert_one(processed)
+            try:
+                inserted = self.db.collection.insert_one(processed)
+            except DuplicateKeyError:
+                return jsonify({"success": False, "message": DUPLICATE_REVENUE_MESSAGE}), 409
+            self.rollups.apply_revenue_change(new=processed)
 
             response_data = OrderedDict([
                 ("_id", {"$oid": str(inserted.inserted_id)}),
@@ -325,67 +536,171 @@ class RevenueController:
         except Exception as e:
             return jsonify({"success": False, "message": str(e)}), 500
     
-    def edit_revenue(self, revenue_id):
+    def revenue_patch_changes(self, patch):
+        if not isinstance(patch, dict):
+            raise ValueError("Update must be an object")
+
+        flat_patch = self.normalize_revenue_data(patch)
+        changes = {}
+        for key, value in flat_patch.items():
+            if key in STORED_INPUTS:
+                try:
+                    value = float(value) if key in FLOAT_INPUTS else int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"{key} must be a number")
+                changes[".".join(STORED_INPUTS[key])] = value
+            elif key == "date":
+                revenue_date = parse_revenue_date(value)
+                if revenue_date is None:
+                    raise ValueError("date must use the dd-mm-yyyy format")
+                changes["date"] = value
+                changes["revenue_date"] = revenue_date
+            elif key == "hotel_id":
+                if isinstance(value, dict):
+                    value = value.get("$oid")
+                if not ObjectId.is_valid(value):
+                    raise ValueError("Invalid hotel ID")
+                changes["hotel_id"] = ObjectId(value)
+
+        if not changes:
+            raise ValueError("No updatable revenue fields given")
+        return changes
+
+    def apply_revenue_patch(self, revenue_oid, changes):
+        after = self.db.collection.find_one_and_update(
+            {"_id": revenue_oid},
+            [
+                {"$unset": PREVIOUS_FIELD},
+                {"$set": {PREVIOUS_FIELD: previous_snapshot(PREVIOUS_PATHS + [tuple(path.split(".")) for path in changes])}}
+            ] + recompute_update_pipeline(changes),
+            return_document=ReturnDocument.AFTER
+        )
+        if not after:
+            return None, None
+
+        self.db.collection.update_one({"_id": revenue_oid}, {"$unset": {PREVIOUS_FIELD: ""}})
+        before = after.pop(PREVIOUS_FIELD)
+        return before, after
+
+    def serialize_revenue(self, doc):
+        doc = dict(doc)
+        doc["_id"] = str(doc["_id"])
+        if "hotel_id" in doc:
+            doc["hotel_id"] = str(doc["hotel_id"])
+        return doc
+
+    def patch_revenues(self):
+        updates = request.json
+        if isinstance(updates, dict):
+            updates = updates.get("updates")
+        if not isinstance(updates, list) or not updates:
+            return jsonify({"success": False, "message": "Send a non-empty list of revenue updates"}), 400
+        if len(updates) > REVENUE_PATCH_MAX_BATCH:
+            return jsonify({
+                "success": False,
+                "message": f"At most {REVENUE_PATCH_MAX_BATCH} revenue updates per request"
+            }), 400
+
+        results = [None] * len(updates)
+        pending = []
+        for i, update in enumerate(updates):
+            revenue_id = update.get("_id") if isinstance(update, dict) else None
+            if isinstance(revenue_id, dict):
+                revenue_id = revenue_id.get("$oid")
+            if not ObjectId.is_valid(revenue_id):
+                results[i] = {"_id": revenue_id, "status": "error", "error": "Invalid revenue ID format"}
+                continue
+            try:
+                pending.append((i, ObjectId(revenue_id), self.revenue_patch_changes(update)))
+            except ValueError as e:
+                results[i] = {"_id": revenue_id, "status": "error", "error": str(e)}
+
+        hotel_ids = {changes["hotel_id"] for _, _, changes in pending if "hotel_id" in changes}
+        known_hotels = {doc["_id"] for doc in self.db.hotels.find({"_id": {"$in": list(hotel_ids)}}, {"_id": 1})}
+
+        rollup_changes = []
         try:
-            updated_data = request.json
-            revenue_oid = ObjectId(revenue_id)
+            for i, revenue_oid, changes in pending:
+                if "hotel_id" in changes and changes["hotel_id"] not in known_hotels:
+                    results[i] = {"_id": str(revenue_oid), "status": "error", "error": "Hotel not found"}
+                    continue
+
+                try:
+                    before, after = self.apply_revenue_patch(revenue_oid, changes)
+                except DuplicateKeyError:
+                    results[i] = {"_id": str(revenue_oid), "status": "error", "error": DUPLICATE_REVENUE_MESSAGE}
+                    continue
+                except Exception as e:
+                    print(f"[Revenue] Patch of {revenue_oid} failed: {e}")
+                    results[i] = {"_id": str(revenue_oid), "status": "error", "error": str(e)}
+                    continue
+
+                if not before:
+                    results[i] = {"_id": str(revenue_oid), "status": "not_found", "error": "Revenue record not found"}
+                    continue
+
+                rollup_changes.append((before, after))
+                results[i] = {"_id": str(revenue_oid), "status": "updated", "data": self.serialize_revenue(after)}
+        finally:
+            self.rollups.apply_revenue_changes(rollup_changes)
+
+        updated = sum(1 for result in results if result["status"] == "updated")
+        return jsonify({
+            "success": updated == len(results),
+            "message": f"Updated {updated} of {len(results)} revenue records",
+            "data": {
+                "updated": updated,
+                "failed": len(results) - updated,
+                "results": results
+            }
+        }), 200
 
-            existing_doc = self.db.collection.find_one({"_id": revenue_oid})
-            if not existing_doc:
-                return jsonify({"success": False, "message": "Revenue record not found"}), 404
+    def edit_revenue(self, revenue_id):
+        if not ObjectId.is_valid(revenue_id):
+            return jsonify({"success": False, "message": "Invalid revenue ID format"}), 400
 
-            hotel_id_raw = updated_data.get("hotel_id", existing_doc.get("hotel_id"))
-            try:
-                hotel_id = ObjectId(hotel_id_raw) if isinstance(hotel_id_raw, str) else hotel_id_raw
-            except Exception as e:
-                return jsonify({"success": False, "message": "Invalid hotel ID"}), 400
-
-            if not self.hotel_exists(hotel_id):
-                return jsonify({"success": False, "message": "Hotel not found"}), 400
-            
-            merged_data = existing_doc.copy()
-            merged_data.update(updated_data)
-            merged_data["hotel_id"] = hotel_id
-
-            flat_data = self.normalize_revenue_data(merged_data)
-            processed_data = self.calculate_revenue(flat_data)
-            processed_data["hotel_id"] = hotel_id
-            processed_data["date"] = flat_data.get("date") 
-
-            result = self.db.collection.update_one(
-                {"_id": revenue_oid},
-                {"$set": processed_data}
-            )
+        try:
+            changes = self.revenue_patch_changes(request.json)
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
 
-            if result.modified_count == 0:
-                return jsonify({
-                    "success": True,
-                    "message": "Revenue update submitted, but no fields were changed",
-                    "data": existing_doc
-                }), 200
+        if "hotel_id" in changes and not self.hotel_exists(changes["hotel_id"]):
+            return jsonify({"success": False, "message": "Hotel not found"}), 400
 
-            updated_revenue = self.db.collection.find_one({"_id": revenue_oid})
-            if updated_revenue:
-                updated_revenue["_id"] = str(updated_revenue["_id"])
-                updated_revenue["hotel_id"] = str(updated_revenue["hotel_id"])
+        try:
+            before, after = self.apply_revenue_patch(ObjectId(revenue_id), changes)
+        except DuplicateKeyError:
+            return jsonify({"success": False, "message": DUPLICATE_REVENUE_MESSAGE}), 409
+        except Exception as e:
+            print("Error:", e)
+            return jsonify({"success": False, "message": str(e)}), 500
+
+        if not before:
+            return jsonify({"success": False, "message": "Revenue record not found"}), 404
 
+        if all(field_value(before, path.split(".")) == field_value(after, path.split(".")) for path in changes):
             return jsonify({
                 "success": True,
-                "message": "Revenue updated successfully",
-                "data": updated_revenue
+                "message": "Revenue update submitted, but no fields were changed",
+                "data": self.serialize_revenue(after)
             }), 200
 
-        except Exception as e:
-            print("Error:", e)
-            return jsonify({"success": False, "message": "Invalid revenue ID format"}), 400
+        self.rollups.apply_revenue_change(old=before, new=after)
+
+        return jsonify({
+            "success": True,
+            "message": "Revenue updated successfully",
+            "data": self.serialize_revenue(after)
+        }), 200
         
     def remove_revenue(self, revenue_id):
         try:
             revenue_oid = ObjectId(revenue_id)
 
-            result = self.db.collection.delete_one({"_id": revenue_oid})
+            deleted = self.db.collection.find_one_and_delete({"_id": revenue_oid})
 
-            if result.deleted_count:
+            if deleted:
+                self.rollups.apply_revenue_change(old=deleted)
                 return jsonify({"success": True, "message": "Revenue deleted successfully"}), 200
             else:
                 return jsonify({"success": False, "message": "Revenue not found"}), 404
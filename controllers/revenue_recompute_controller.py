@@ -0,0 +1,106 @@
+from datetime import datetime
+from pymongo import UpdateOne  # type: ignore
+from config import REVENUE_RECOMPUTE_BATCH_SIZE
+from controllers.rollup_controller import RollupController
+from models.monthly_rollup import MonthlyRollups
+from utils.rates import RATE_TABLE, rate_table_signature
+from utils.revenue_engine import FLOAT_INPUTS, INT_INPUTS, DERIVED_FIELDS, field_value, recompute_documents
+
+JOB_NAME = "revenue_recompute"
+
+INPUT_PATHS = ["date"] + [".".join(path) for path in list(FLOAT_INPUTS.values()) + list(INT_INPUTS.values())]
+PROJECTION = {
+    "hotel_id": 1,
+    **{path: 1 for path in INPUT_PATHS},
+    **{".".join(path): 1 for path in DERIVED_FIELDS.values()}
+}
+
+# the write only lands if the inputs still hold the values the recompute read
+def unchanged_filter(doc):
+    return {"_id": doc["_id"], **{path: field_value(doc, path.split(".")) for path in INPUT_PATHS}}
+
+def apply_fields(doc, fields):
+    updated = {key: dict(value) if isinstance(value, dict) else value for key, value in doc.items()}
+    for path, value in fields.items():
+        target = updated
+        *parents, leaf = path.split(".")
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = value
+    return updated
+
+class RevenueRecomputeController:
+    def __init__(self, db):
+        self.db = db
+        self.rollups = RollupController(MonthlyRollups())
+
+    def start_checkpoint(self, signature, restart=False):
+        checkpoint = self.db.checkpoints.find_one({"_id": JOB_NAME})
+        if (checkpoint and not restart and checkpoint.get("status") == "running"
+                and checkpoint.get("rate_signature") == signature):
+            print(f"[Recompute] Resuming after {checkpoint.get('last_id')} ({checkpoint.get('scanned', 0)} scanned).")
+            return checkpoint
+
+        now = datetime.utcnow()
+        checkpoint = {
+            "_id": JOB_NAME,
+            "status": "running",
+            "rate_signature": signature,
+            "last_id": None,
+            "scanned": 0,
+            "recomputed": 0,
+            "modified": 0,
+            "started_at": now,
+            "updated_at": now
+        }
+        self.db.checkpoints.replace_one({"_id": JOB_NAME}, checkpoint, upsert=True)
+        return checkpoint
+
+    def record_batch(self, last_id, scanned, recomputed, modified):
+        self.db.checkpoints.update_one({"_id": JOB_NAME}, {
+            "$set": {"last_id": last_id, "updated_at": datetime.utcnow()},
+            "$inc": {"scanned": scanned, "recomputed": recomputed, "modified": modified}
+        })
+
+    def finish(self):
+        now = datetime.utcnow()
+        self.db.checkpoints.update_one({"_id": JOB_NAME}, {
+            "$set": {"status": "completed", "finished_at": now, "updated_at": now}
+        })
+        return self.db.checkpoints.find_one({"_id": JOB_NAME})
+
+    def recompute_batch(self, docs, table):
+        recomputed, updates = recompute_documents(docs, table)
+        if not updates:
+            return recomputed, 0
+
+        filters = [unchanged_filter(doc) for doc, _ in updates]
+        ops = [UpdateOne(query, {"$set": fields}) for query, (_, fields) in zip(filters, updates)]
+        result = self.db.collection.bulk_write(ops, ordered=False)
+
+        # documents edited since the read were skipped, and their edit already moved the rollups
+        if result.matched_count < len(ops):
+            matched = {doc["_id"] for doc in self.db.collection.find({"$or": filters}, {"_id": 1})}
+            updates = [(doc, fields) for doc, fields in updates if doc["_id"] in matched]
+            print(f"[Recompute] Skipped {len(ops) - len(updates)} documents edited during the batch.")
+
+        self.rollups.apply_revenue_changes([(doc, apply_fields(doc, fields)) for doc, fields in updates])
+        return recomputed, result.modified_count
+
+    def run(self, restart=False, batch_size=REVENUE_RECOMPUTE_BATCH_SIZE, table=None):
+        table = table or RATE_TABLE
+        checkpoint = self.start_checkpoint(rate_table_signature(table), restart)
+        last_id = checkpoint.get("last_id")
+
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+            docs = list(self.db.collection.find(query, PROJECTION).sort("_id", 1).limit(batch_size))
+            if not docs:
+                break
+
+            recomputed, modified = self.recompute_batch(docs, table)
+            last_id = docs[-1]["_id"]
+            self.record_batch(last_id, len(docs), recomputed, modified)
+            print(f"[Recompute] Up to {last_id}: {recomputed}/{len(docs)} recomputed, {modified} modified.")
+
+        return self.finish()
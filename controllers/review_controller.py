@@ -3,74 +3,129 @@ import subprocess
 from bson import ObjectId # type: ignore
 from flask import request, jsonify, current_app # type: ignore
 from datetime import datetime
+from config import REVIEW_INGEST_BATCH_SIZE, REVIEW_INGEST_MAX_BATCH_SIZE, EXPORT_BATCH_SIZE
+from utils.pagination import keyset_match, next_cursor
+from utils.text_search import build_search_text, text_search_query
+from utils.streams import NDJSON_MIMETYPES, EXPORT_FORMATS, iter_ndjson, iter_batches, export_response
 from models.hotels import Hotels
-from models.review import Reviews
+from models.review import Reviews, review_fingerprint, parse_review_date
 from controllers.scrape_log_controller import ScrapeLogController
-from sentiment_analysis.sentiment_analysis import analyze_sentiment
+from controllers.ingest_job_controller import IngestJobController
+from controllers.rollup_controller import RollupController
+from models.ingest_job import IngestJobs
+from models.monthly_rollup import MonthlyRollups
+from sentiment_analysis.parallel import analyze_comments
 from controllers.sentiments_controller import save_sentiment_analysis
-from langdetect import detect, LangDetectException # type: ignore
+from pymongo.errors import BulkWriteError # type: ignore
 import subprocess
 import re
 import requests # type: ignore
 
-def prepare_unicode_friendly_regex(text):
-    safe_text = re.escape(text)
-    safe_text = safe_text.replace('', '[\u200B-\u200D\uFEFF]?')
-    return re.compile(safe_text, re.IGNORECASE)
+DUPLICATE_KEY_ERROR = 11000
+
+REVIEW_LIST_PROJECTION = {
+    "_id": 1,
+    "review_date": 1,
+    "username": 1,
+    "comment": 1,
+    "rating": 1,
+    "timestamp": 1,
+    "hotel_name": 1,
+    "OTA": 1,
+    "sentiment": 1,
+    "positive_score": 1,
+    "negative_score": 1
+}
+REVIEW_EXPORT_COLUMNS = ["_id", "hotel_id", "hotel_name", "OTA", "username", "rating", "timestamp",
+                         "comment", "sentiment", "positive_score", "negative_score"]
+
+def parse_batch_size(value):
+    if value is None:
+        return REVIEW_INGEST_BATCH_SIZE
+    try:
+        batch_size = int(value)
+    except ValueError:
+        batch_size = 0
+    if not 0 < batch_size <= REVIEW_INGEST_MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size must be an integer between 1 and {REVIEW_INGEST_MAX_BATCH_SIZE}")
+    return batch_size
 
 class ReviewController:
     def __init__(self):
         self.hotels_collection = Hotels().collection
         self.reviews_collection = Reviews().collection
+        self.ingest_jobs = IngestJobController(IngestJobs())
+        self.rollups = RollupController(MonthlyRollups())
     
     def save_reviews(self, reviews, hotel_id=None):
         if not reviews:
             return {"message": "No reviews to save", "status": 400, "inserted_ids": []}
 
-        filters = [{
-            "username": r["username"],
-            "comment": r["comment"],
-            "timestamp": r["timestamp"],
-            "hotel_name": r.get("hotel_name", ""),
-            "OTA": r["OTA"]
-        } for r in reviews]
-
-        existing = self.reviews_collection.find({"$or": filters})
-        existing_keys = {
-            f"{r['username']}-{r['comment']}-{r['timestamp']}-{r['hotel_name']}-{r['OTA']}"
-            for r in existing
+        for r in reviews:
+            r["fingerprint"] = review_fingerprint(r)
+
+        fingerprints = list({r["fingerprint"] for r in reviews})
+        seen_fingerprints = {
+            doc["fingerprint"]
+            for doc in self.reviews_collection.find(
+                {"fingerprint": {"$in": fingerprints}},
+                {"_id": 0, "fingerprint": 1}
+            )
         }
 
+        candidates = []
+        duplicate_count = 0
+
+        for r in reviews:
+            if r["fingerprint"] in seen_fingerprints:
+                duplicate_count += 1
+                continue
+            seen_fingerprints.add(r["fingerprint"])
+            candidates.append(r)
+
+        analyzed = analyze_comments([r.get("comment", "") for r in candidates])
+
         new_reviews = []
+        scores = []
         non_id_count = 0
 
-        for r in reviews:
-            key = f"{r['username']}-{r['comment']}-{r['timestamp']}-{r['hotel_name']}-{r['OTA']}"
-            if key not in existing_keys:
-                try:
-                    if detect(r.get("comment", "")) != 'id':
-                        non_id_count += 1
-                        continue
-                except LangDetectException:
-                    non_id_count += 1
-                    continue
-
-                if hotel_id:
-                    r["hotel_id"] = ObjectId(hotel_id)
-                new_reviews.append(r)
+        for r, score in zip(candidates, analyzed):
+            if score is None:
+                non_id_count += 1
+                continue
+
+            if hotel_id:
+                r["hotel_id"] = ObjectId(hotel_id)
+            r["sentiment"], r["positive_score"], r["negative_score"] = score
+            r["review_date"] = parse_review_date(r.get("timestamp"))
+            r["search_text"] = build_search_text(r.get("username"), r.get("comment"), r.get("hotel_name"))
+            new_reviews.append(r)
+            scores.append(score)
 
         if not new_reviews:
             return {
                 "message": f"No new Indonesian reviews to save. Skipped {non_id_count} non-Indonesian reviews.",
                 "inserted_ids": [],
+                "skipped_count": non_id_count,
+                "duplicate_count": duplicate_count,
                 "status": 200
             }
 
-        result = self.reviews_collection.insert_many(new_reviews)
+        try:
+            self.reviews_collection.insert_many(new_reviews, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            if any(err.get("code") != DUPLICATE_KEY_ERROR for err in write_errors):
+                raise
+            failed = {err["index"] for err in write_errors}
+            duplicate_count += len(failed)
+            new_reviews = [r for i, r in enumerate(new_reviews) if i not in failed]
+            scores = [score for i, score in enumerate(scores) if i not in failed]
+
+        inserted_ids = [r["_id"] for r in new_reviews]
 
         sentiment_data = []
-        for review, inserted_id in zip(new_reviews, result.inserted_ids):
-            sentiment, pos, neg = analyze_sentiment(review.get("comment", ""))
+        for review, inserted_id, (sentiment, pos, neg) in zip(new_reviews, inserted_ids, scores):
             sentiment_data.append({
                 "review_id": inserted_id,
                 "comment": review.get("comment", ""),
@@ -81,10 +136,13 @@ class ReviewController:
             })
 
         save_sentiment_analysis(sentiment_data)
+        self.rollups.apply_reviews(new_reviews)
 
         return {
             "message": f"Reviews saved. Skipped {non_id_count} non-Indonesian reviews.",
-            "inserted_ids": result.inserted_ids,
+            "inserted_ids": inserted_ids,
+            "skipped_count": non_id_count,
+            "duplicate_count": duplicate_count,
             "status": 201
         }
 
@@ -133,7 +191,52 @@ class ReviewController:
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    def wants_async(self):
+        return (
+            request.args.get("async", "").lower() in ("1", "true")
+            or "respond-async" in request.headers.get("Prefer", "")
+        )
+
+    def enqueue_reviews(self):
+        if request.mimetype in NDJSON_MIMETYPES:
+            hotel_id = request.args.get("hotel_id")
+            ota = request.args.get("ota", "unknown")
+            try:
+                batch_size = parse_batch_size(request.args.get("batch_size"))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            batches = iter_batches(iter_ndjson(request.stream), batch_size)
+        else:
+            data = request.json or {}
+            hotel_id = data.get("hotel_id")
+            ota = data.get("ota", "unknown")
+            reviews = data.get("reviews", [])
+            if not isinstance(reviews, list):
+                return jsonify({"error": "reviews must be a list"}), 400
+            batches = iter_batches(reviews, REVIEW_INGEST_BATCH_SIZE)
+
+        if hotel_id and not ObjectId.is_valid(hotel_id):
+            return jsonify({"error": "Invalid hotel_id format"}), 400
+
+        try:
+            job_id, total_reviews = self.ingest_jobs.enqueue(batches, hotel_id, ota)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid payload: {str(e)}"}), 400
+
+        return jsonify({
+            "message": "Reviews queued for ingest",
+            "job_id": str(job_id),
+            "total_reviews": total_reviews,
+            "status_url": f"/ingest_jobs/{job_id}"
+        }), 202
+
     def receive_reviews(self):
+        if self.wants_async():
+            return self.enqueue_reviews()
+
+        if request.mimetype in NDJSON_MIMETYPES:
+            return self.receive_reviews_stream()
+
         data = request.json
         reviews = data.get("reviews", [])
         hotel_id = data.get("hotel_id")
@@ -184,20 +287,91 @@ class ReviewController:
                 "note": scrape_log_data["note"]
             }), 500
     
-    def get_all_reviews(self):
-        page = int(request.args.get('page', 1))
-        per_page = 15
-        skip = (page - 1) * per_page
+    def receive_reviews_stream(self):
+        hotel_id = request.args.get("hotel_id")
+        ota = request.args.get("ota", "unknown")
+        try:
+            batch_size = parse_batch_size(request.args.get("batch_size"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        scrape_log_data = {
+            "hotel_id": hotel_id,
+            "ota": ota,
+            "timestamp": datetime.utcnow(),
+            "total_reviews": 0,
+            "note": "",
+            "batches": [],
+        }
+
+        db = current_app.scrape_log_db
+        log_controller = ScrapeLogController(db)
+
+        received = inserted = skipped = duplicates = 0
+
+        try:
+            for number, batch in enumerate(iter_batches(iter_ndjson(request.stream), batch_size), start=1):
+                result = self.save_reviews(batch, hotel_id)
+                batch_inserted = len(result.get("inserted_ids", []))
+
+                received += len(batch)
+                inserted += batch_inserted
+                skipped += result.get("skipped_count", 0)
+                duplicates += result.get("duplicate_count", 0)
+
+                scrape_log_data["batches"].append({
+                    "batch": number,
+                    "received": len(batch),
+                    "inserted": batch_inserted,
+                    "skipped_non_indonesian": result.get("skipped_count", 0),
+                    "duplicates": result.get("duplicate_count", 0),
+                })
+
+            scrape_log_data["status"] = "Success"
+            scrape_log_data["total_reviews"] = inserted
+
+            if inserted:
+                scrape_log_data["note"] = f"Scraping successful, {inserted} new reviews inserted."
+            else:
+                scrape_log_data["note"] = "Scraping succeeded but no new reviews were inserted (possibly duplicates)."
+
+            log_controller.create_scrape_log(scrape_log_data)
+
+            status = 201 if inserted else 200
+            return jsonify({
+                "message": f"Reviews saved. Skipped {skipped} non-Indonesian reviews.",
+                "received": received,
+                "inserted": inserted,
+                "skipped_non_indonesian": skipped,
+                "duplicates": duplicates,
+                "batches": len(scrape_log_data["batches"]),
+                "status": status,
+                "note": scrape_log_data["note"]
+            }), status
+
+        except Exception as e:
+            scrape_log_data["status"] = "Error"
+            scrape_log_data["total_reviews"] = inserted
+            scrape_log_data["note"] = f"Error occurred after {inserted} reviews were inserted: {str(e)}"
+
+            log_controller.create_scrape_log(scrape_log_data)
 
-        search_query = request.args.get('search', '').strip()
-        sentiment_filter = request.args.get('sentiment')
-        min_rating = request.args.get('min_rating', type=float)
-        max_rating = request.args.get('max_rating', type=float)
-        ota_filter = request.args.get('ota')
-        min_date = request.args.get('min_date')
-        max_date = request.args.get('max_date')
+            return jsonify({
+                "message": "Internal server error",
+                "error": str(e),
+                "note": scrape_log_data["note"]
+            }), 500
 
-        hotel_ids_param = request.args.get('hotel_id')
+    def build_reviews_match(self, args):
+        search_query = args.get('search', '').strip()
+        sentiment_filter = args.get('sentiment')
+        min_rating = args.get('min_rating', type=float)
+        max_rating = args.get('max_rating', type=float)
+        ota_filter = args.get('ota')
+        min_date = args.get('min_date')
+        max_date = args.get('max_date')
+
+        hotel_ids_param = args.get('hotel_id')
         early_match_conditions = []
 
         if min_rating is not None or max_rating is not None:
@@ -211,6 +385,9 @@ class ReviewController:
         if ota_filter:
             early_match_conditions.append({"OTA": ota_filter})
 
+        if sentiment_filter:
+            early_match_conditions.append({"sentiment": sentiment_filter.lower()})
+
         if hotel_ids_param:
             try:
                 hotel_ids = [ObjectId(hid) for hid in hotel_ids_param.split(',') if hid]
@@ -218,95 +395,94 @@ class ReviewController:
             except Exception:
                 pass
 
-        pipeline = []
+        date_filter = {"$type": "date"}
+        if min_date:
+            date_filter["$gte"] = datetime.strptime(min_date, "%d-%m-%Y")
+        if max_date:
+            date_filter["$lte"] = datetime.strptime(max_date, "%d-%m-%Y")
+        early_match_conditions.append({"review_date": date_filter})
 
-        if early_match_conditions:
-            pipeline.append({"$match": {"$and": early_match_conditions}})
+        text_query = text_search_query(search_query) if search_query else None
+        rank_by_relevance = bool(text_query) and args.get('rank') == 'relevance'
 
-        pipeline.append({
-            "$addFields": {
-                "timestamp_date": {
-                    "$dateFromString": {
-                        "dateString": "$timestamp",
-                        "format": "%d-%m-%Y",
-                        "onError": None,
-                        "onNull": None
-                    }
-                }
-            }
-        })
+        cursor_token = None if rank_by_relevance else args.get('cursor')
+        if cursor_token:
+            early_match_conditions.append(keyset_match("review_date", -1, cursor_token))
 
-        pipeline.append({
-            "$match": {
-                "timestamp_date": {"$ne": None}
-            }
-        })
-
-        if min_date or max_date:
-            date_filter = {}
-            if min_date:
-                date_filter["$gte"] = datetime.strptime(min_date, "%d-%m-%Y")
-            if max_date:
-                date_filter["$lte"] = datetime.strptime(max_date, "%d-%m-%Y")
-            pipeline.append({"$match": {"timestamp_date": date_filter}})
-
-        pipeline.append({
-            "$lookup": {
-                "from": "sentiments",
-                "localField": "_id",
-                "foreignField": "review_id",
-                "as": "sentiment_info"
-            }
-        })
-        pipeline.append({
-            "$unwind": {
-                "path": "$sentiment_info",
-                "preserveNullAndEmptyArrays": True
-            }
-        })
-
-        post_lookup_conditions = []
-
-        if search_query:
-            regex = prepare_unicode_friendly_regex(search_query)
-            post_lookup_conditions.append({
-                "$or": [
-                    {"username": {"$regex": regex}},
-                    {"comment": {"$regex": regex}},
-                    {"hotel_name": {"$regex": regex}}
-                ]
-            })
+        match = {"$and": early_match_conditions}
+        if text_query:
+            match["$text"] = text_query
 
-        if sentiment_filter:
-            post_lookup_conditions.append({
-                "sentiment_info.sentiment": sentiment_filter.lower()
-            })
+        return match, rank_by_relevance, cursor_token
+
+    def build_reviews_pipeline(self, args):
+        page = int(args.get('page', 1))
+        per_page = 15
+        skip = (page - 1) * per_page
+
+        match, rank_by_relevance, cursor_token = self.build_reviews_match(args)
 
-        if post_lookup_conditions:
-            pipeline.append({"$match": {"$and": post_lookup_conditions}})
+        if rank_by_relevance:
+            sort = {"score": {"$meta": "textScore"}, "review_date": -1, "_id": -1}
+        else:
+            sort = {"review_date": -1, "_id": -1}
+
+        pipeline = [
+            {"$match": match},
+            {"$sort": sort}
+        ]
+
+        if not cursor_token:
+            pipeline.append({"$skip": skip})
 
         pipeline += [
-            {"$sort": {"timestamp_date": -1}},
+            {"$limit": per_page + 1},
             {
                 "$project": {
-                    "_id": 0,
-                    "username": 1,
-                    "comment": 1,
-                    "rating": 1,
-                    "timestamp": 1,
-                    "hotel_name": 1,
-                    "OTA": 1,
-                    "sentiment": "$sentiment_info.sentiment",
-                    "positive_score": "$sentiment_info.positive_score",
-                    "negative_score": "$sentiment_info.negative_score",
+                    **REVIEW_LIST_PROJECTION,
                     "hotel_id": { "$toString": "$hotel_id" } 
                 }
-            },
-            {"$skip": skip},
-            {"$limit": per_page}
+            }
         ]
 
-        return list(self.reviews_collection.aggregate(pipeline))
+        return pipeline, per_page, rank_by_relevance
+
+    def get_all_reviews(self):
+        pipeline, per_page, rank_by_relevance = self.build_reviews_pipeline(request.args)
+        reviews = list(self.reviews_collection.aggregate(pipeline))
+        cursor = None if rank_by_relevance else next_cursor(reviews, "review_date", -1, per_page)
+
+        reviews = reviews[:per_page]
+        for review in reviews:
+            del review["_id"], review["review_date"]
+
+        return reviews, cursor
     
+    def export_reviews(self):
+        fmt = request.args.get("format", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+        try:
+            match, _, _ = self.build_reviews_match(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        cursor = self.reviews_collection.find(
+            match, {**REVIEW_LIST_PROJECTION, "hotel_id": 1}
+        ).sort([("review_date", -1), ("_id", -1)]).batch_size(EXPORT_BATCH_SIZE)
+
+        def rows():
+            try:
+                yield from cursor
+            finally:
+                cursor.close()
+
+        return export_response(rows(), REVIEW_EXPORT_COLUMNS, fmt, "reviews")
+
     def fetch_reviews(self):
-        return jsonify({"reviews": self.get_all_reviews()})
\ No newline at end of file
+        try:
+            reviews, cursor = self.get_all_reviews()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"reviews": reviews, "next_cursor": cursor})
\ No newline at end of file
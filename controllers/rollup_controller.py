@@ -0,0 +1,217 @@
+from collections import Counter
+from datetime import datetime
+from bson import ObjectId  # type: ignore
+from pymongo import UpdateOne  # type: ignore
+from models.indexes import create_declared_indexes
+from utils.cache import VersionCounters
+
+REVENUE_COMPONENTS = {
+    "room_revenue": ("room_details", "total_room_revenue"),
+    "restaurant_revenue": ("restaurant", "total_restaurant_revenue"),
+    "other_revenue": ("other_revenue", "total_other_revenue"),
+    "nett_revenue": ("nett_revenue",),
+    "gross_revenue": ("gross_revenue",),
+    "grand_total_revenue": ("grand_total_revenue",)
+}
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+BUCKET_FIELDS = {
+    "monthly_rollups": "month",
+    "daily_rollups": "day"
+}
+
+def parse_rollup_date(value, fmt="%d-%m-%Y"):
+    if isinstance(value, str):
+        try:
+            value = datetime.strptime(value, fmt)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return datetime(value.year, value.month, value.day)
+
+def rollup_month(value, fmt="%d-%m-%Y"):
+    day = parse_rollup_date(value, fmt)
+    return day.strftime("%Y-%m") if day else None
+
+def bucket_value(bucket_field, day):
+    return day.strftime("%Y-%m") if bucket_field == "month" else day
+
+def bucket_expression(bucket_field, date_field):
+    if bucket_field == "month":
+        return {"$dateToString": {"format": "%Y-%m", "date": date_field}}
+    return {"$dateTrunc": {"date": date_field, "unit": "day"}}
+
+def revenue_components(doc):
+    components = {}
+    for key, path in REVENUE_COMPONENTS.items():
+        value = doc
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        components[key] = value if isinstance(value, (int, float)) else 0
+    return components
+
+def merge_stage(into, bucket_field):
+    return {"$merge": {"into": into, "on": ["hotel_id", bucket_field], "whenMatched": "merge", "whenNotMatched": "insert"}}
+
+def revenue_rollup_pipeline(into, bucket_field="month"):
+    return [
+        {
+            "$project": {
+                "hotel_id": 1,
+                "parsed_date": {
+                    "$dateFromString": {
+                        "dateString": "$date",
+                        "format": "%d-%m-%Y",
+                        "onError": None,
+                        "onNull": None
+                    }
+                },
+                **{key: {"$ifNull": ["$" + ".".join(path), 0]} for key, path in REVENUE_COMPONENTS.items()}
+            }
+        },
+        {"$match": {"hotel_id": {"$type": "objectId"}, "parsed_date": {"$type": "date"}}},
+        {
+            "$group": {
+                "_id": {
+                    "hotel_id": "$hotel_id",
+                    "bucket": bucket_expression(bucket_field, "$parsed_date")
+                },
+                **{key: {"$sum": "$" + key} for key in REVENUE_COMPONENTS}
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "hotel_id": "$_id.hotel_id",
+                bucket_field: "$_id.bucket",
+                "revenue": {key: "$" + key for key in REVENUE_COMPONENTS}
+            }
+        },
+        merge_stage(into, bucket_field)
+    ]
+
+def review_rollup_pipeline(into, bucket_field="month"):
+    return [
+        {
+            "$match": {
+                "hotel_id": {"$type": "objectId"},
+                "review_date": {"$type": "date"},
+                "sentiment": {"$in": list(SENTIMENT_LABELS)}
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "hotel_id": "$hotel_id",
+                    "bucket": bucket_expression(bucket_field, "$review_date")
+                },
+                "total": {"$sum": 1},
+                **{
+                    label: {"$sum": {"$cond": [{"$eq": ["$sentiment", label]}, 1, 0]}}
+                    for label in SENTIMENT_LABELS
+                }
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "hotel_id": "$_id.hotel_id",
+                bucket_field: "$_id.bucket",
+                "sentiment": {key: "$" + key for key in ("total",) + SENTIMENT_LABELS}
+            }
+        },
+        merge_stage(into, bucket_field)
+    ]
+
+class RollupController:
+    def __init__(self, db):
+        self.db = db
+        self.versions = VersionCounters(db.cache_versions)
+        self.collections = (db.collection, db.daily)
+
+    def increment_ops(self, hotel_id, day, fields):
+        now = datetime.utcnow()
+        ops = []
+        for collection in self.collections:
+            bucket_field = BUCKET_FIELDS[collection.name]
+            ops.append((collection, UpdateOne(
+                {"hotel_id": hotel_id, bucket_field: bucket_value(bucket_field, day)},
+                {"$inc": fields, "$set": {"updated_at": now}},
+                upsert=True
+            )))
+        return ops
+
+    def write(self, ops):
+        for collection in self.collections:
+            collection_ops = [op for target, op in ops if target is collection]
+            if collection_ops:
+                collection.bulk_write(collection_ops, ordered=False)
+
+    def revenue_ops(self, doc, sign=1):
+        hotel_id = doc.get("hotel_id")
+        day = parse_rollup_date(doc.get("date"))
+        if not isinstance(hotel_id, ObjectId) or not day:
+            return []
+        fields = {f"revenue.{key}": sign * value for key, value in revenue_components(doc).items()}
+        return self.increment_ops(hotel_id, day, fields)
+
+    def apply_revenue_change(self, old=None, new=None):
+        self.apply_revenue_changes([(old, new)])
+
+    def apply_revenue_changes(self, changes):
+        ops = []
+        hotel_ids = set()
+        for old, new in changes:
+            for doc, sign in ((old, -1), (new, 1)):
+                if doc:
+                    ops += self.revenue_ops(doc, sign)
+                    hotel_ids.add(doc.get("hotel_id"))
+        if ops:
+            self.write(ops)
+            self.versions.bump(hotel_ids)
+
+    def apply_reviews(self, reviews):
+        counts = Counter()
+        for review in reviews:
+            hotel_id = review.get("hotel_id")
+            day = parse_rollup_date(review.get("review_date"))
+            label = review.get("sentiment")
+            if not isinstance(hotel_id, ObjectId) or not day or label not in SENTIMENT_LABELS:
+                continue
+            counts[(hotel_id, day, "total")] += 1
+            counts[(hotel_id, day, label)] += 1
+
+        fields_by_day = {}
+        for (hotel_id, day, key), count in counts.items():
+            fields_by_day.setdefault((hotel_id, day), {})[f"sentiment.{key}"] = count
+
+        ops = []
+        for (hotel_id, day), fields in fields_by_day.items():
+            ops += self.increment_ops(hotel_id, day, fields)
+        if ops:
+            self.write(ops)
+            self.versions.bump(hotel_id for hotel_id, _ in fields_by_day)
+
+    def rebuild_collection(self, collection):
+        bucket_field = BUCKET_FIELDS[collection.name]
+        staging = self.db.db[f"{collection.name}_rebuild"]
+        staging.drop()
+        create_declared_indexes(staging, collection.name)
+
+        self.db.revenues.aggregate(revenue_rollup_pipeline(staging.name, bucket_field))
+        self.db.reviews.aggregate(review_rollup_pipeline(staging.name, bucket_field))
+
+        total = staging.count_documents({})
+        hotel_ids = set(collection.distinct("hotel_id")) | set(staging.distinct("hotel_id"))
+        staging.rename(collection.name, dropTarget=True)
+        return total, hotel_ids
+
+    def rebuild(self):
+        totals = {}
+        hotel_ids = set()
+        for collection in self.collections:
+            totals[collection.name], rebuilt_hotels = self.rebuild_collection(collection)
+            hotel_ids |= rebuilt_hotels
+        self.versions.bump(hotel_ids)
+        return totals
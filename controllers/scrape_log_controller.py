@@ -2,6 +2,7 @@ from flask import request, jsonify  # type: ignore
 from bson import ObjectId # type: ignore
 import re
 from datetime import datetime
+from utils.pagination import keyset_match, next_cursor
 
 class ScrapeLogController:
     def __init__(self, db):
@@ -24,26 +25,37 @@ class ScrapeLogController:
         page = int(request.args.get("page", 1))
         limit = int(request.args.get("limit", 15))
         skip = (page - 1) * limit
+        cursor_token = request.args.get("cursor")
+
+        query = {}
+        if cursor_token:
+            try:
+                query = keyset_match("timestamp", -1, cursor_token)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
 
         cursor = (
             self.db.collection
-            .find({})
-            .sort("timestamp", -1)
-            .skip(skip)
-            .limit(limit)
+            .find(query)
+            .sort([("timestamp", -1), ("_id", -1)])
+            .skip(0 if cursor_token else skip)
+            .limit(limit + 1)
         )
         total = self.db.collection.count_documents({})
 
-        logs = []
-        for log in cursor:
+        logs = list(cursor)
+        next_page = next_cursor(logs, "timestamp", -1, limit)
+
+        logs = logs[:limit]
+        for log in logs:
             log["_id"] = str(log["_id"])
-            logs.append(log)
 
         return jsonify({
             "data": logs,
             "total": total,
             "page": page,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_page
         })
     
     def get_scrape_log(self, log_id):
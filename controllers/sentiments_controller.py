@@ -1,4 +1,9 @@
+from flask import request, jsonify  # type: ignore
+from config import EXPORT_BATCH_SIZE
 from models.sentiment import Sentiment  
+from utils.streams import EXPORT_FORMATS, export_response
+
+SENTIMENT_EXPORT_COLUMNS = ["review_id", "comment", "sentiment", "positive_score", "negative_score", "created_at"]
 
 sentiment_db = Sentiment()
 sentiment_collection = sentiment_db.collection
@@ -12,4 +17,19 @@ def save_sentiment_analysis(sentiments):
 
 def get_all_sentiments():
     sentiments = list(sentiment_collection.find({}, {"_id": 0}))  
-    return sentiments
\ No newline at end of file
+    return sentiments
+
+def export_sentiments():
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    cursor = sentiment_collection.find({}, {"_id": 0}).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+
+    def rows():
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    return export_response(rows(), SENTIMENT_EXPORT_COLUMNS, fmt, "sentiments")
@@ -1,7 +1,115 @@
-from pymongo import MongoClient  # type: ignore
-from config import MONGO_URI
+import os
+import threading
+from pymongo import MongoClient, monitoring  # type: ignore
+from config import (
+    MONGO_URI, MONGO_DB_NAME, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE,
+    MONGO_CONNECT_TIMEOUT_MS, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS, MONGO_READ_PREFERENCE
+)
+
+class ConnectionMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pools = 0
+        self.open_connections = 0
+        self.checked_out = 0
+        self.created_total = 0
+        self.checkout_failures = 0
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "pools": self.pools,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "created_total": self.created_total,
+                "checkout_failures": self.checkout_failures,
+            }
+
+    def pool_created(self, event):
+        with self.lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self.lock:
+            self.pools -= 1
+
+    def connection_created(self, event):
+        with self.lock:
+            self.open_connections += 1
+            self.created_total += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self.lock:
+            self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self.lock:
+            self.checked_out += 1
+
+    def connection_checked_in(self, event):
+        with self.lock:
+            self.checked_out -= 1
+
+_client = None
+_client_lock = threading.Lock()
+connection_metrics = ConnectionMetrics()
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                    readPreference=MONGO_READ_PREFERENCE,
+                    event_listeners=[connection_metrics],
+                    connect=False,
+                )
+    return _client
+
+def get_database(db_name=MONGO_DB_NAME):
+    return get_client()[db_name]
+
+def client_metrics():
+    metrics = connection_metrics.snapshot()
+    metrics["clients"] = 0 if _client is None else 1
+    return metrics
+
+# models created at import time keep the parent's client, and PyMongo already resets its
+# pools in a forked child; only our own lock may have been held by another thread at fork
+def _reset_metrics_lock():
+    connection_metrics.lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_metrics_lock)
 
 class BaseDB:
-    def __init__(self, db_name="hotelPerformance"):
-        self.client = MongoClient(MONGO_URI)
-        self.db = self.client[db_name]
\ No newline at end of file
+    def __init__(self, db_name=MONGO_DB_NAME):
+        self.client = get_client()
+        self.db = self.client[db_name]
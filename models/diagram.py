@@ -6,4 +6,8 @@ class Diagram(BaseDB):
         self.hotels = self.db.hotels
         self.revenues = self.db.revenues
         self.reviews = self.db.reviews
-        self.sentiments = self.db.sentiments
\ No newline at end of file
+        self.sentiments = self.db.sentiments
+        self.monthly_rollups = self.db.monthly_rollups
+        self.daily_rollups = self.db.daily_rollups
+        self.cache_versions = self.db.cache_versions
+        self.response_cache = self.db.response_cache
@@ -4,4 +4,7 @@ class Hotels(BaseDB):
     def __init__(self):
         super().__init__()
         self.collection = self.db.hotels
-        self.revenues = self.db.revenues 
+        self.revenues = self.db.revenues
+        self.monthly_rollups = self.db.monthly_rollups
+        self.daily_rollups = self.db.daily_rollups
+        self.cache_versions = self.db.cache_versions
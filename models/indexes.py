@@ -0,0 +1,157 @@
+import os
+import threading
+from pymongo import ASCENDING, DESCENDING, TEXT  # type: ignore
+from pymongo.errors import OperationFailure, PyMongoError  # type: ignore
+
+INDEXES = {
+    "hotels": [
+        {"keys": [("hotel_name", ASCENDING)], "name": "hotel_name"},
+        {"keys": [("search_prefixes", ASCENDING)], "name": "search_prefixes"},
+    ],
+    "reviews": [
+        {
+            "keys": [("fingerprint", ASCENDING)],
+            "name": "fingerprint_unique",
+            "unique": True,
+            "partialFilterExpression": {"fingerprint": {"$type": "string"}},
+        },
+        {"keys": [("review_date", DESCENDING), ("_id", DESCENDING)], "name": "review_date_id"},
+        {
+            "keys": [("hotel_id", ASCENDING), ("review_date", DESCENDING), ("_id", DESCENDING)],
+            "name": "hotel_id_review_date_id"
+        },
+        {
+            "keys": [("OTA", ASCENDING), ("review_date", DESCENDING), ("_id", DESCENDING)],
+            "name": "ota_review_date_id"
+        },
+        {
+            "keys": [("hotel_id", ASCENDING), ("sentiment", ASCENDING), ("review_date", DESCENDING), ("_id", DESCENDING)],
+            "name": "hotel_id_sentiment_review_date_id"
+        },
+        {
+            "keys": [("sentiment", ASCENDING), ("review_date", DESCENDING), ("_id", DESCENDING)],
+            "name": "sentiment_review_date_id"
+        },
+        {"keys": [("search_text", TEXT)], "name": "search_text", "default_language": "none"},
+    ],
+    "revenues": [
+        {"keys": [("hotel_id", ASCENDING), ("date", ASCENDING)], "name": "hotel_id_date_unique", "unique": True},
+        {"keys": [("revenue_date", DESCENDING), ("_id", DESCENDING)], "name": "revenue_date_id"},
+        {
+            "keys": [("hotel_id", ASCENDING), ("revenue_date", DESCENDING), ("_id", DESCENDING)],
+            "name": "hotel_id_revenue_date_id"
+        },
+        {"keys": [("grand_total_revenue", DESCENDING), ("_id", DESCENDING)], "name": "grand_total_revenue_id"},
+        {
+            "keys": [("hotel_id", ASCENDING), ("grand_total_revenue", DESCENDING), ("_id", DESCENDING)],
+            "name": "hotel_id_grand_total_revenue_id"
+        },
+    ],
+    "sentiments": [
+        {"keys": [("review_id", ASCENDING)], "name": "review_id"},
+    ],
+    "scrape_log": [
+        {"keys": [("timestamp", DESCENDING), ("_id", DESCENDING)], "name": "timestamp_id"},
+        {"keys": [("hotel_id", ASCENDING), ("timestamp", DESCENDING)], "name": "hotel_id_timestamp"},
+    ],
+    "users": [
+        {"keys": [("username", ASCENDING)], "name": "username_unique", "unique": True},
+    ],
+    "monthly_rollups": [
+        {"keys": [("hotel_id", ASCENDING), ("month", ASCENDING)], "name": "hotel_id_month_unique", "unique": True},
+        {"keys": [("month", ASCENDING)], "name": "month"},
+    ],
+    "daily_rollups": [
+        {"keys": [("hotel_id", ASCENDING), ("day", ASCENDING)], "name": "hotel_id_day_unique", "unique": True},
+        {"keys": [("day", ASCENDING)], "name": "day"},
+    ],
+    "response_cache": [
+        {"keys": [("expires_at", ASCENDING)], "name": "expires_at_ttl", "expireAfterSeconds": 0},
+    ],
+    "ingest_jobs": [
+        {"keys": [("status", ASCENDING), ("created_at", ASCENDING)], "name": "status_created_at"},
+    ],
+    "ingest_job_chunks": [
+        {"keys": [("job_id", ASCENDING), ("seq", ASCENDING)], "name": "job_id_seq_unique", "unique": True},
+    ],
+}
+
+def create_declared_indexes(collection, collection_name=None):
+    collection_name = collection_name or collection.name
+    created = []
+    for spec in INDEXES.get(collection_name, []):
+        options = {k: v for k, v in spec.items() if k != "keys"}
+        try:
+            collection.create_index(spec["keys"], **options)
+            created.append(f"{collection_name}.{spec['name']}")
+        except OperationFailure as e:
+            print(f"[Index] Failed to create {collection_name}.{spec['name']}: {e}")
+    return created
+
+def ensure_indexes(db, collections=None):
+    created = []
+    for collection_name in INDEXES:
+        if collections and collection_name not in collections:
+            continue
+        created += create_declared_indexes(db[collection_name])
+    return created
+
+def index_key(keys):
+    return tuple((field, direction) for field, direction in keys)
+
+def existing_indexes(collection):
+    existing = {}
+    for name, info in collection.index_information().items():
+        keys = info["key"]
+        if any(field == "_fts" for field, _ in keys):
+            keys = [("_fts", TEXT)]
+        existing[name] = index_key(keys)
+    return existing
+
+def declared_key(spec):
+    if any(direction == TEXT for _, direction in spec["keys"]):
+        return (("_fts", TEXT),)
+    return index_key(spec["keys"])
+
+def index_report(db, collections=None):
+    missing, extra = [], []
+    for collection_name, specs in INDEXES.items():
+        if collections and collection_name not in collections:
+            continue
+        existing = existing_indexes(db[collection_name])
+        existing_keys = set(existing.values())
+        declared_names = {spec["name"] for spec in specs}
+        declared_keys = {declared_key(spec) for spec in specs}
+
+        for spec in specs:
+            if spec["name"] not in existing and declared_key(spec) not in existing_keys:
+                missing.append(f"{collection_name}.{spec['name']}")
+
+        for name, keys in existing.items():
+            if name == "_id_" or name in declared_names or keys in declared_keys:
+                continue
+            extra.append(f"{collection_name}.{name}")
+    return {"missing": missing, "extra": extra}
+
+def report_missing_indexes(db):
+    try:
+        missing = index_report(db)["missing"]
+    except PyMongoError as e:
+        print(f"[Index] Could not verify indexes: {e}")
+        return None
+    if missing:
+        print(f"[Index] Missing indexes: {', '.join(missing)}. Run python -m scripts.ensure_indexes")
+    else:
+        print("[Index] All declared indexes present")
+    return missing
+
+_checked_pid = None
+_check_lock = threading.Lock()
+
+def schedule_index_check(db):
+    global _checked_pid
+    with _check_lock:
+        if _checked_pid == os.getpid():
+            return
+        _checked_pid = os.getpid()
+    threading.Thread(target=report_missing_indexes, args=(db,), name="index-check", daemon=True).start()
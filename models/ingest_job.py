@@ -0,0 +1,7 @@
+from .base_db import BaseDB
+
+class IngestJobs(BaseDB):
+    def __init__(self):
+        super().__init__()
+        self.collection = self.db.ingest_jobs
+        self.chunks = self.db.ingest_job_chunks
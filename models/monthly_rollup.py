@@ -0,0 +1,10 @@
+from .base_db import BaseDB
+
+class MonthlyRollups(BaseDB):
+    def __init__(self):
+        super().__init__()
+        self.collection = self.db.monthly_rollups
+        self.daily = self.db.daily_rollups
+        self.revenues = self.db.revenues
+        self.reviews = self.db.reviews
+        self.cache_versions = self.db.cache_versions
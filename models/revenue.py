@@ -1,5 +1,12 @@
+from datetime import datetime
 from .base_db import BaseDB
 
+def parse_revenue_date(date, fmt="%d-%m-%Y"):
+    try:
+        return datetime.strptime(date, fmt)
+    except Exception:
+        return None
+
 class Revenue(BaseDB):
     def __init__(self):
         super().__init__()
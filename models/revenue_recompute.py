@@ -0,0 +1,7 @@
+from .base_db import BaseDB
+
+class RevenueRecompute(BaseDB):
+    def __init__(self):
+        super().__init__()
+        self.collection = self.db.revenues
+        self.checkpoints = self.db.job_checkpoints
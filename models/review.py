@@ -1,6 +1,20 @@
+import hashlib
+from datetime import datetime
 from .base_db import BaseDB
 
+FINGERPRINT_FIELDS = ("username", "comment", "timestamp", "hotel_name", "OTA")
+
+def review_fingerprint(review):
+    raw = "\x1f".join(str(review.get(field) or "") for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def parse_review_date(timestamp, fmt="%d-%m-%Y"):
+    try:
+        return datetime.strptime(timestamp, fmt)
+    except Exception:
+        return None
+
 class Reviews(BaseDB):
     def __init__(self):
         super().__init__()
-        self.collection = self.db.reviews
\ No newline at end of file
+        self.collection = self.db.reviews
@@ -1,12 +1,10 @@
-from pymongo import MongoClient  # type: ignore
-from config import MONGO_URI
+from .base_db import get_client, get_database
 
-client = MongoClient(MONGO_URI)
-db = client.hotelPerformance
+db = get_database()
 users_collection = db.users  
 
 class Users:
     def __init__(self, app=None):
-        self.client = client
+        self.client = get_client()
         self.db = db
         self.collection = users_collection
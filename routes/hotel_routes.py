@@ -12,6 +12,7 @@ def create_hotel_blueprint(app):
     hotel_bp.add_url_rule("/hotels", "create_hotel", token_required(controller.create_hotel), methods=["POST"])
     hotel_bp.add_url_rule("/hotels/<hotel_id>", "update_hotel", token_required(controller.update_hotel), methods=["PUT"])
     hotel_bp.add_url_rule("/hotels/<hotel_id>", "delete_hotel", token_required(controller.delete_hotel), methods=["DELETE"])
+    hotel_bp.add_url_rule("/hotels/autocomplete", "autocomplete_hotels", token_required(controller.autocomplete_hotels), methods=["GET"])
     hotel_bp.add_url_rule("/hotels/dropdown", "get_hotels_dropdown", token_required(controller.get_hotels_dropdown), methods=["GET"])
 
     return hotel_bp
@@ -1,5 +1,6 @@
 from flask import Blueprint  # type: ignore
 from controllers.revenue_controller import RevenueController
+from controllers.kpi_controller import KpiController
 from models.revenue import Revenue
 from controllers.middleware.auth_middleware import token_required
 
@@ -7,9 +8,14 @@ def create_revenue_blueprint(app):
     revenue_bp = Blueprint("revenue", __name__)
     db = Revenue()
     controller = RevenueController(db)
+    kpis = KpiController(db)
 
     revenue_bp.add_url_rule("/revenues", "get_revenues", token_required(controller.get_revenues), methods=["GET"])
     revenue_bp.add_url_rule("/revenues", "create_revenue", token_required(controller.create_revenue), methods=["POST"])
+    revenue_bp.add_url_rule("/revenues", "patch_revenues", token_required(controller.patch_revenues), methods=["PATCH"])
+    revenue_bp.add_url_rule("/revenues/kpis", "get_revenue_kpis", token_required(kpis.get_kpis), methods=["GET"])
+    revenue_bp.add_url_rule("/revenues/export", "export_revenues", token_required(controller.export_revenues), methods=["GET"])
+    revenue_bp.add_url_rule("/revenues/import", "bulk_import_revenues", token_required(controller.bulk_import_revenues), methods=["POST"])
     revenue_bp.add_url_rule("/revenues/<revenue_id>", "edit_revenue", token_required(controller.edit_revenue), methods=["PUT"])
     revenue_bp.add_url_rule("/revenues/<revenue_id>", "remove_revenue", token_required(controller.remove_revenue), methods=["DELETE"])
     
@@ -8,5 +8,7 @@ def create_review_blueprint(app):
     review_bp.add_url_rule("/scrape/<source>", view_func=controller.scrape_reviews, methods=["POST"])
     review_bp.add_url_rule("/reviews", view_func=controller.receive_reviews, methods=["POST"])
     review_bp.add_url_rule("/reviews", view_func=controller.fetch_reviews, methods=["GET"])
+    review_bp.add_url_rule("/reviews/export", view_func=controller.export_reviews, methods=["GET"])
+    review_bp.add_url_rule("/ingest_jobs/<job_id>", view_func=controller.ingest_jobs.get_ingest_job, methods=["GET"])
 
     return review_bp
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify  # type: ignore
-from controllers.sentiments_controller import get_all_sentiments
+from controllers.sentiments_controller import get_all_sentiments, export_sentiments
 
 def create_sentiment_blueprint(app):
     sentiments_bp = Blueprint("sentiments", __name__)
@@ -9,4 +9,8 @@ def create_sentiment_blueprint(app):
         sentiments = get_all_sentiments()
         return jsonify({"reviews": sentiments})
 
+    @sentiments_bp.route("/sentiments/export", methods=["GET"])
+    def export_sentiments_route():
+        return export_sentiments()
+
     return sentiments_bp
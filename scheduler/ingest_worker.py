@@ -0,0 +1,99 @@
+import os
+import threading
+from datetime import datetime
+from config import INGEST_WORKER_THREADS, INGEST_POLL_INTERVAL, INGEST_LEASE_SECONDS, INGEST_MAX_ATTEMPTS
+from controllers.ingest_job_controller import IngestJobController
+from controllers.review_controller import ReviewController
+from controllers.scrape_log_controller import ScrapeLogController
+from models.ingest_job import IngestJobs
+from models.scrape_log import ScrapeLog
+
+class IngestWorker(threading.Thread):
+    def __init__(self, app, name="ingest-worker"):
+        super().__init__(name=name, daemon=True)
+        self.app = app
+        self.stop_event = threading.Event()
+        self.jobs = IngestJobController(IngestJobs())
+        self.reviews = ReviewController()
+        self.logs = ScrapeLogController(ScrapeLog())
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        print(f"[{self.name}] Started.")
+        while not self.stop_event.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                print(f"[{self.name}] Error while polling ingest jobs: {e}")
+                processed = False
+            if not processed:
+                self.stop_event.wait(INGEST_POLL_INTERVAL)
+
+    def run_once(self):
+        expired = self.jobs.fail_exhausted_job(INGEST_MAX_ATTEMPTS)
+        if expired:
+            print(f"[{self.name}] Ingest job {expired['_id']} failed: {expired['error']}.")
+            with self.app.app_context():
+                self.write_scrape_log(expired, "Error", f"Error occurred: {expired['error']}")
+            return True
+
+        job = self.jobs.claim_next_job(INGEST_LEASE_SECONDS, INGEST_MAX_ATTEMPTS)
+        if not job:
+            return False
+
+        with self.app.app_context():
+            self.process_job(job)
+        return True
+
+    def process_job(self, job):
+        try:
+            for chunk in self.jobs.iter_pending_chunks(job):
+                result = self.reviews.save_reviews(chunk["reviews"], job.get("hotel_id"))
+                self.jobs.record_chunk(job["_id"], chunk["seq"], result, INGEST_LEASE_SECONDS)
+        except Exception as e:
+            print(f"[{self.name}] Ingest job {job['_id']} failed (attempt {job['attempts']}): {e}")
+            if job["attempts"] < INGEST_MAX_ATTEMPTS:
+                self.jobs.release_job(job["_id"], str(e))
+                return
+            job = self.jobs.finish_job(job["_id"], "failed", str(e))
+            self.write_scrape_log(job, "Error", f"Error occurred: {str(e)}")
+            return
+
+        job = self.jobs.finish_job(job["_id"], "done")
+        if job["inserted"]:
+            note = f"Scraping successful, {job['inserted']} new reviews inserted."
+        else:
+            note = "Scraping succeeded but no new reviews were inserted (possibly duplicates)."
+        self.write_scrape_log(job, "Success", note)
+
+    def write_scrape_log(self, job, status, note):
+        self.logs.create_scrape_log({
+            "hotel_id": job.get("hotel_id"),
+            "ota": job.get("ota", "unknown"),
+            "timestamp": datetime.utcnow(),
+            "total_reviews": job.get("inserted", 0),
+            "status": status,
+            "note": note,
+            "ingest_job_id": str(job["_id"]),
+        })
+
+_workers = []
+_workers_pid = None
+_workers_lock = threading.Lock()
+
+def start_ingest_workers(app, count=INGEST_WORKER_THREADS):
+    global _workers, _workers_pid
+    with _workers_lock:
+        if _workers_pid == os.getpid():
+            return _workers
+        _workers = [IngestWorker(app, name=f"ingest-worker-{i + 1}") for i in range(count)]
+        for worker in _workers:
+            worker.start()
+        _workers_pid = os.getpid()
+        return _workers
+
+if __name__ == "__main__":
+    from app import app
+    IngestWorker(app).run()
@@ -0,0 +1,27 @@
+from pymongo import UpdateOne  # type: ignore
+from models.indexes import ensure_indexes
+
+BATCH_SIZE = 1000
+
+def run_backfill(collection, query, projection, compute, batch_size=BATCH_SIZE,
+                 target=None, id_field="_id", sort=None, ordered=False):
+    target = collection if target is None else target
+    updated = 0
+    ops = []
+
+    cursor = collection.find(query, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    for doc in cursor.batch_size(batch_size):
+        ops.append(UpdateOne({"_id": doc[id_field]}, {"$set": compute(doc)}))
+        if len(ops) >= batch_size:
+            updated += target.bulk_write(ops, ordered=ordered).modified_count
+            ops = []
+
+    if ops:
+        updated += target.bulk_write(ops, ordered=ordered).modified_count
+    return updated
+
+def ensure_backfill_indexes(db, collection_name):
+    created = ensure_indexes(db, collections=[collection_name])
+    print(f"[Backfill] Ensured indexes: {', '.join(created) or 'none'}")
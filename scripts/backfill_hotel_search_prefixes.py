@@ -0,0 +1,20 @@
+import sys
+from models.hotels import Hotels
+from utils.text_search import HOTEL_SEARCH_FIELDS, hotel_search_prefixes
+from scripts._backfill import run_backfill, ensure_backfill_indexes
+
+def main(rebuild=False):
+    hotels = Hotels()
+
+    updated = run_backfill(
+        hotels.collection,
+        {} if rebuild else {"search_prefixes": {"$exists": False}},
+        {field: 1 for field in HOTEL_SEARCH_FIELDS},
+        lambda doc: {"search_prefixes": hotel_search_prefixes(doc)}
+    )
+    print(f"[Backfill] Set search_prefixes on {updated} hotels.")
+
+    ensure_backfill_indexes(hotels.db, "hotels")
+
+if __name__ == "__main__":
+    main(rebuild="--rebuild" in sys.argv[1:])
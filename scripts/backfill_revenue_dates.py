@@ -0,0 +1,61 @@
+import sys
+from pymongo import DeleteOne  # type: ignore
+from controllers.rollup_controller import RollupController
+from models.monthly_rollup import MonthlyRollups
+from models.revenue import Revenue, parse_revenue_date
+from scripts._backfill import BATCH_SIZE, run_backfill, ensure_backfill_indexes
+
+LEGACY_INDEX = "hotel_id_date"
+
+def find_duplicate_revenues(collection):
+    groups = collection.aggregate([
+        {"$match": {"hotel_id": {"$exists": True}, "date": {"$exists": True}}},
+        {"$group": {"_id": {"hotel_id": "$hotel_id", "date": "$date"}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ], allowDiskUse=True)
+    return [_id for group in groups for _id in sorted(group["ids"])[1:]]
+
+def remove_revenues(collection, revenue_ids):
+    removed = 0
+    rollups = RollupController(MonthlyRollups())
+    for start in range(0, len(revenue_ids), BATCH_SIZE):
+        docs = list(collection.find({"_id": {"$in": revenue_ids[start:start + BATCH_SIZE]}}))
+        if not docs:
+            continue
+        removed += collection.bulk_write([DeleteOne({"_id": doc["_id"]}) for doc in docs], ordered=False).deleted_count
+        rollups.apply_revenue_changes([(doc, None) for doc in docs])
+    return removed
+
+def main(remove_duplicates=False):
+    revenues = Revenue()
+    collection = revenues.collection
+
+    unparseable = 0
+
+    def compute(doc):
+        nonlocal unparseable
+        revenue_date = parse_revenue_date(doc.get("date"))
+        if revenue_date is None:
+            unparseable += 1
+        return {"revenue_date": revenue_date}
+
+    updated = run_backfill(collection, {"revenue_date": {"$exists": False}}, {"date": 1}, compute)
+    print(f"[Backfill] Set revenue_date on {updated} revenues ({unparseable} with unparseable dates).")
+
+    duplicates = find_duplicate_revenues(collection)
+    if duplicates:
+        if not remove_duplicates:
+            print(f"[Backfill] {len(duplicates)} duplicate revenues for the same hotel and date found. "
+                  "Re-run with --remove-duplicates before creating the unique index.")
+            return
+
+        print(f"[Backfill] Removed {remove_revenues(collection, duplicates)} duplicate revenues, keeping the oldest.")
+
+    if LEGACY_INDEX in collection.index_information():
+        collection.drop_index(LEGACY_INDEX)
+        print(f"[Backfill] Dropped non-unique index revenues.{LEGACY_INDEX}")
+
+    ensure_backfill_indexes(revenues.db, "revenues")
+
+if __name__ == "__main__":
+    main(remove_duplicates="--remove-duplicates" in sys.argv[1:])
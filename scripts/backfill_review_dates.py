@@ -0,0 +1,21 @@
+from models.review import Reviews, parse_review_date
+from scripts._backfill import run_backfill, ensure_backfill_indexes
+
+def main():
+    reviews = Reviews()
+    unparseable = 0
+
+    def compute(doc):
+        nonlocal unparseable
+        review_date = parse_review_date(doc.get("timestamp"))
+        if review_date is None:
+            unparseable += 1
+        return {"review_date": review_date}
+
+    updated = run_backfill(reviews.collection, {"review_date": {"$exists": False}}, {"timestamp": 1}, compute)
+    print(f"[Backfill] Set review_date on {updated} reviews ({unparseable} with unparseable timestamps).")
+
+    ensure_backfill_indexes(reviews.db, "reviews")
+
+if __name__ == "__main__":
+    main()
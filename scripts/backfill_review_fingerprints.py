@@ -0,0 +1,75 @@
+import sys
+from pymongo import UpdateOne, DeleteOne  # type: ignore
+from pymongo.errors import BulkWriteError  # type: ignore
+from models.review import Reviews, review_fingerprint
+from models.sentiment import Sentiment
+from models.indexes import ensure_indexes
+
+BATCH_SIZE = 1000
+DUPLICATE_KEY_ERROR = 11000
+
+def flush_updates(collection, ops, ids, conflicts):
+    try:
+        return collection.bulk_write(ops, ordered=False).modified_count
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if any(err.get("code") != DUPLICATE_KEY_ERROR for err in write_errors):
+            raise
+        conflicts.extend(ids[err["index"]] for err in write_errors)
+        return e.details.get("nModified", 0)
+
+def backfill_fingerprints(collection):
+    updated = 0
+    conflicts = []
+    ops = []
+    ids = []
+    projection = {"username": 1, "comment": 1, "timestamp": 1, "hotel_name": 1, "OTA": 1}
+
+    for doc in collection.find({"fingerprint": {"$exists": False}}, projection).batch_size(BATCH_SIZE):
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"fingerprint": review_fingerprint(doc)}}))
+        ids.append(doc["_id"])
+        if len(ops) >= BATCH_SIZE:
+            updated += flush_updates(collection, ops, ids, conflicts)
+            ops = []
+            ids = []
+
+    if ops:
+        updated += flush_updates(collection, ops, ids, conflicts)
+    return updated, conflicts
+
+def find_duplicate_ids(collection):
+    groups = collection.aggregate([
+        {"$match": {"fingerprint": {"$type": "string"}}},
+        {"$group": {"_id": "$fingerprint", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ], allowDiskUse=True)
+    return [_id for group in groups for _id in sorted(group["ids"])[1:]]
+
+def remove_reviews(collection, review_ids):
+    if not review_ids:
+        return 0
+    deleted = collection.bulk_write([DeleteOne({"_id": _id}) for _id in review_ids], ordered=False).deleted_count
+    Sentiment().collection.delete_many({"review_id": {"$in": review_ids}})
+    return deleted
+
+def main(remove_duplicates=False):
+    reviews = Reviews()
+    collection = reviews.collection
+
+    updated, conflicts = backfill_fingerprints(collection)
+    print(f"[Backfill] Added fingerprints to {updated} reviews.")
+
+    duplicates = conflicts + find_duplicate_ids(collection)
+    if duplicates:
+        if not remove_duplicates:
+            print(f"[Backfill] {len(duplicates)} duplicate reviews found. "
+                  "Re-run with --remove-duplicates before creating the unique index.")
+            return
+
+        print(f"[Backfill] Removed {remove_reviews(collection, duplicates)} duplicate reviews.")
+
+    created = ensure_indexes(reviews.db, collections=["reviews"])
+    print(f"[Backfill] Ensured indexes: {', '.join(created) or 'none'}")
+
+if __name__ == "__main__":
+    main(remove_duplicates="--remove-duplicates" in sys.argv[1:])
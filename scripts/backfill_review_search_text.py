@@ -0,0 +1,20 @@
+import sys
+from models.review import Reviews
+from utils.text_search import build_search_text
+from scripts._backfill import run_backfill, ensure_backfill_indexes
+
+def main(rebuild=False):
+    reviews = Reviews()
+
+    updated = run_backfill(
+        reviews.collection,
+        {} if rebuild else {"search_text": {"$exists": False}},
+        {"username": 1, "comment": 1, "hotel_name": 1},
+        lambda doc: {"search_text": build_search_text(doc.get("username"), doc.get("comment"), doc.get("hotel_name"))}
+    )
+    print(f"[Backfill] Set search_text on {updated} reviews.")
+
+    ensure_backfill_indexes(reviews.db, "reviews")
+
+if __name__ == "__main__":
+    main(rebuild="--rebuild" in sys.argv[1:])
@@ -0,0 +1,18 @@
+import sys
+from models.base_db import BaseDB
+from models.indexes import ensure_indexes, index_report
+
+def main(check_only=False):
+    db = BaseDB().db
+
+    if not check_only:
+        created = ensure_indexes(db)
+        print(f"[Index] Ensured indexes: {', '.join(created) or 'none'}")
+
+    report = index_report(db)
+    print(f"[Index] Missing: {', '.join(report['missing']) or 'none'}")
+    print(f"[Index] Not declared in models/indexes.py: {', '.join(report['extra']) or 'none'}")
+    return 1 if report["missing"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(check_only="--check" in sys.argv[1:]))
@@ -0,0 +1,94 @@
+import sys
+from datetime import datetime
+from bson import ObjectId  # type: ignore
+from werkzeug.datastructures import MultiDict  # type: ignore
+from controllers.review_controller import ReviewController
+from controllers.revenue_controller import RevenueController
+from controllers.diagram_controller import rollup_pipeline, range_pipeline, range_source
+from controllers.kpi_controller import kpi_pipeline
+from models.base_db import BaseDB
+from models.revenue import Revenue
+
+def plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+def explain_aggregate(db, collection_name, pipeline):
+    return db.command("aggregate", collection_name, pipeline=pipeline, explain=True)
+
+def build_cases(db):
+    hotel = db.hotels.find_one({}, {"_id": 1})
+    hotel_id = str(hotel["_id"]) if hotel else str(ObjectId())
+
+    reviews = ReviewController()
+    revenues = RevenueController(Revenue())
+
+    review_args = [
+        {},
+        {"hotel_id": hotel_id},
+        {"ota": "Traveloka"},
+        {"sentiment": "positive"},
+        {"hotel_id": hotel_id, "sentiment": "negative"},
+        {"search": "kamar bersih"},
+    ]
+    revenue_args = [
+        {},
+        {"hotel_id": hotel_id},
+        {"sort_by": "revenue"},
+        {"hotel_id": hotel_id, "sort_by": "revenue"},
+        {"hotel_id": hotel_id, "min_date": "01-01-2024", "max_date": "31-12-2024"},
+    ]
+
+    for args in review_args:
+        pipeline = reviews.build_reviews_pipeline(MultiDict(args))[0]
+        yield f"get_all_reviews {args}", "reviews", lambda p=pipeline: explain_aggregate(db, "reviews", p)
+
+    for args in revenue_args:
+        pipeline = revenues.build_revenues_pipeline(MultiDict(args))[0]
+        yield f"get_revenues {args}", "revenues", lambda p=pipeline: explain_aggregate(db, "revenues", p)
+
+    today = datetime.today()
+    for hotel_ids in (None, [ObjectId(hotel_id)]):
+        for year in (None, today.year):
+            args = (hotel_ids, year, today.year, today.month)
+            label = f"hotel_ids={hotel_ids} year={year}"
+            yield (f"get_revenue_sentiment_diagram {label}", "monthly_rollups",
+                   lambda p=rollup_pipeline(*args): explain_aggregate(db, "monthly_rollups", p))
+
+        start, end = datetime(today.year - 1, 1, 1), datetime(today.year - 1, 12, 31)
+        for granularity in ("weekly", "quarterly"):
+            source = range_source(start, end, granularity)
+            yield (f"get_revenue_sentiment_diagram hotel_ids={hotel_ids} {granularity}", source,
+                   lambda p=range_pipeline(hotel_ids, start, end, granularity), c=source: explain_aggregate(db, c, p))
+
+        yield (f"get_revenue_kpis hotel_ids={hotel_ids}", "revenues",
+               lambda p=kpi_pipeline(hotel_ids, start, end): explain_aggregate(db, "revenues", p))
+
+def main():
+    db = BaseDB().db
+    collscans = 0
+    blocking_sorts = 0
+
+    for label, collection_name, explain in build_cases(db):
+        stages = list(plan_stages(explain()))
+        indexes = sorted({s["indexName"] for s in stages if "indexName" in s})
+        scanned = any(s["stage"] == "COLLSCAN" for s in stages)
+        sorted_in_memory = any(s["stage"] == "SORT" for s in stages)
+        collscans += scanned
+        blocking_sorts += sorted_in_memory
+
+        status = "COLLSCAN" if scanned else "SORT" if sorted_in_memory else "ok"
+        print(f"[Explain] {status:8} {collection_name:15} {label} indexes={', '.join(indexes) or '-'}")
+
+    print(f"[Explain] {collscans} quer{'y' if collscans == 1 else 'ies'} with COLLSCAN stages")
+    print(f"[Explain] {blocking_sorts} quer{'y' if blocking_sorts == 1 else 'ies'} with in-memory SORT stages")
+    return 1 if collscans else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
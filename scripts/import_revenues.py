@@ -0,0 +1,27 @@
+import sys
+from controllers.revenue_controller import RevenueController
+from models.revenue import Revenue
+from utils.streams import iter_csv, iter_ndjson
+
+def main(path, hotel_id=None):
+    reader = iter_csv if path.lower().endswith(".csv") else iter_ndjson
+    with open(path, "rb") as stream:
+        summary = RevenueController(Revenue()).import_revenues(reader(stream), hotel_id)
+
+    print(f"[Import] Received {summary['received']} rows: "
+          f"{summary['inserted']} inserted, {summary['updated']} updated, {len(summary['errors'])} errors.")
+    for error in summary["errors"]:
+        print(f"[Import] Row {error['row']}: {error['error']}")
+    if "aborted" in summary:
+        aborted = summary["aborted"]
+        print(f"[Import] Aborted at row {aborted['row']}: {aborted['error']}. "
+              f"The first {summary['received']} rows were committed.")
+    return 1 if summary["errors"] or "aborted" in summary else 0
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    hotel_id = next((arg.split("=", 1)[1] for arg in sys.argv[1:] if arg.startswith("--hotel-id=")), None)
+    if not args:
+        print("Usage: python -m scripts.import_revenues <file.csv|file.ndjson> [--hotel-id=<id>]")
+        sys.exit(2)
+    sys.exit(main(args[0], hotel_id))
@@ -0,0 +1,28 @@
+from models.review import Reviews
+from models.sentiment import Sentiment
+from scripts._backfill import run_backfill, ensure_backfill_indexes
+
+def main():
+    reviews = Reviews()
+
+    # ordered writes in created_at order, so the latest sentiment of a review wins
+    updated = run_backfill(
+        Sentiment().collection,
+        {},
+        {"_id": 0, "review_id": 1, "sentiment": 1, "positive_score": 1, "negative_score": 1},
+        lambda doc: {
+            "sentiment": doc.get("sentiment"),
+            "positive_score": doc.get("positive_score", 0),
+            "negative_score": doc.get("negative_score", 0),
+        },
+        target=reviews.collection,
+        id_field="review_id",
+        sort=[("created_at", 1)],
+        ordered=True
+    )
+    print(f"[Migrate] Copied sentiment onto {updated} reviews.")
+
+    ensure_backfill_indexes(reviews.db, "reviews")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from controllers.rollup_controller import RollupController
+from models.monthly_rollup import MonthlyRollups
+
+def main():
+    totals = RollupController(MonthlyRollups()).rebuild()
+    for name, total in totals.items():
+        print(f"[Rollup] Rebuilt {name} with {total} documents.")
+
+if __name__ == "__main__":
+    main()
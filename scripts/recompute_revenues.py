@@ -0,0 +1,11 @@
+import sys
+from controllers.revenue_recompute_controller import RevenueRecomputeController
+from models.revenue_recompute import RevenueRecompute
+
+def main(restart=False):
+    summary = RevenueRecomputeController(RevenueRecompute()).run(restart=restart)
+    print(f"[Recompute] Done: {summary['scanned']} scanned, {summary['recomputed']} recomputed, "
+          f"{summary['modified']} modified.")
+
+if __name__ == "__main__":
+    main(restart="--restart" in sys.argv[1:])
@@ -0,0 +1,38 @@
+import csv
+import sys
+import time
+from sentiment_analysis.sentiment_analysis import analyze_sentiment, analyze_sentiment_batch
+
+def load_labeled_reviews(path="sentiment_analysis/labeled_reviews.csv"):
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    return [row["review"] for row in rows], [row["label"] for row in rows]
+
+def accuracy(predicted, expected):
+    return sum(1 for p, e in zip(predicted, expected) if p == e) / len(expected) if expected else 0
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main(repeat=200, rounds=30):
+    texts, labels = load_labeled_reviews()
+    corpus = texts * repeat
+
+    # rounds alternate between the two paths so that machine noise hits both alike
+    single_elapsed = batch_elapsed = float("inf")
+    for _ in range(rounds):
+        elapsed, single_labels = timed(lambda: [analyze_sentiment(text)[0] for text in corpus])
+        single_elapsed = min(single_elapsed, elapsed)
+        elapsed, (batch_labels, _, _) = timed(lambda: analyze_sentiment_batch(corpus))
+        batch_elapsed = min(batch_elapsed, elapsed)
+
+    print(f"Reviews scored: {len(corpus)} ({len(texts)} labeled x {repeat}), best of {rounds} rounds")
+    print(f"analyze_sentiment:       {len(corpus) / single_elapsed:,.0f} reviews/s, "
+          f"accuracy {accuracy(single_labels[:len(texts)], labels):.2%}")
+    print(f"analyze_sentiment_batch: {len(corpus) / batch_elapsed:,.0f} reviews/s, "
+          f"accuracy {accuracy(batch_labels[:len(texts)], labels):.2%}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
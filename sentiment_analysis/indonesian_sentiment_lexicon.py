@@ -1,2 +1,11 @@
 CONTRAST_WORDS = {"tetapi", "namun", "tapi", "padahal", "cuma", "sayangnya"}
-NEGATION_WORDS = {"tidak", "bukan", "jangan", "tak"}
+NEGATION_WORDS = {"tidak", "bukan", "jangan", "tak", "kurang"}
+INDONESIAN_STOPWORDS = {
+    "yang", "dan", "di", "ke", "dari", "ini", "itu", "tidak", "tak", "bukan", "sangat", "untuk",
+    "dengan", "tapi", "tetapi", "namun", "juga", "saya", "kami", "kita", "aku", "kamu", "ada",
+    "sudah", "udah", "belum", "akan", "bisa", "karena", "jadi", "lagi", "saja", "aja", "sekali",
+    "banget", "kurang", "lebih", "agak", "cukup", "buat", "pada", "oleh", "atau", "kalau", "kalo",
+    "yg", "dgn", "tdk", "gak", "ga", "nggak", "enggak", "nya", "pun", "lah", "kok", "sih", "dong",
+    "kamar", "sarapan", "pelayanan", "kolam", "renang", "menginap", "lokasi", "harga", "tempat",
+}
+INTENSIFIER_WORDS = {"sangat", "terlalu", "begitu", "amat", "sekali", "banget", "cukup", "agak"}
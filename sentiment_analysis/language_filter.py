@@ -0,0 +1,92 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from langdetect import DetectorFactory, detect, LangDetectException # type: ignore
+from config import LANGUAGE_CACHE_SIZE
+from sentiment_analysis.sentiment_analysis import POSITIVE_WORDS, NEGATIVE_WORDS
+from sentiment_analysis.indonesian_sentiment_lexicon import INDONESIAN_STOPWORDS
+
+DetectorFactory.seed = 0
+
+ZERO_WIDTH_RE = re.compile('[\u200B-\u200D\uFEFF]')
+WHITESPACE_RE = re.compile(r'\s+')
+WORD_RE = re.compile(r'[^\W\d_]+(?:-[^\W\d_]+)*')
+
+LEXICON_WORDS = {w for w in POSITIVE_WORDS | NEGATIVE_WORDS if " " not in w}
+
+SHORT_TEXT_WORDS = 3
+LEXICON_RATIO = 0.5
+
+def normalize_text(text):
+    text = ZERO_WIDTH_RE.sub("", text or "")
+    return WHITESPACE_RE.sub(" ", text).strip().lower()
+
+def langdetect_detector(text):
+    try:
+        return detect(text)
+    except LangDetectException:
+        return None
+
+class LanguageFilter:
+    def __init__(self, target="id", detector=langdetect_detector, cache_size=LANGUAGE_CACHE_SIZE):
+        self.target = target
+        self.detector = detector
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def fast_path(self, text):
+        words = WORD_RE.findall(text)
+        if not words:
+            return False
+
+        stop_hits = sum(1 for w in words if w in INDONESIAN_STOPWORDS)
+        lexicon_hits = sum(1 for w in words if w in LEXICON_WORDS)
+
+        if len(words) <= SHORT_TEXT_WORDS and stop_hits + lexicon_hits:
+            return True
+        if stop_hits and stop_hits + lexicon_hits >= len(words) * LEXICON_RATIO:
+            return True
+        return None
+
+    def classify(self, text):
+        verdict = self.fast_path(text)
+        if verdict is None:
+            verdict = self.detector(text) == self.target
+        return verdict
+
+    def cache_get(self, key):
+        with self.lock:
+            if key not in self.cache:
+                return None
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+    def cache_put(self, key, value):
+        with self.lock:
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def is_target_language(self, text):
+        return self.filter_batch([text])[0]
+
+    def filter_batch(self, texts):
+        normalized = [normalize_text(t) for t in texts]
+        keys = [hashlib.sha1(t.encode("utf-8")).hexdigest() for t in normalized]
+
+        verdicts = {}
+        for key, text in zip(keys, normalized):
+            if key in verdicts:
+                continue
+            cached = self.cache_get(key)
+            if cached is None:
+                cached = self.classify(text)
+                self.cache_put(key, cached)
+            verdicts[key] = cached
+
+        return [verdicts[key] for key in keys]
+
+language_filter = LanguageFilter()
@@ -0,0 +1,56 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import (
+    REVIEW_PARALLEL_ENABLED, REVIEW_PARALLEL_THRESHOLD,
+    REVIEW_PARALLEL_CHUNK_SIZE, REVIEW_PARALLEL_WORKERS
+)
+from sentiment_analysis.language_filter import language_filter
+from sentiment_analysis.sentiment_analysis import analyze_sentiment_batch
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def process_comments(comments):
+    keep = language_filter.filter_batch(comments)
+    labels, positive_scores, negative_scores = analyze_sentiment_batch(
+        [c for c, k in zip(comments, keep) if k]
+    )
+    scores = iter(zip(labels, positive_scores, negative_scores))
+    return [next(scores) if k else None for k in keep]
+
+def get_pool():
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=REVIEW_PARALLEL_WORKERS)
+            _pool_pid = os.getpid()
+        return _pool
+
+def reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def analyze_comments(comments):
+    if not REVIEW_PARALLEL_ENABLED or len(comments) < REVIEW_PARALLEL_THRESHOLD:
+        return process_comments(comments)
+
+    chunks = [
+        comments[i:i + REVIEW_PARALLEL_CHUNK_SIZE]
+        for i in range(0, len(comments), REVIEW_PARALLEL_CHUNK_SIZE)
+    ]
+
+    try:
+        results = get_pool().map(process_comments, chunks)
+        return [item for chunk in results for item in chunk]
+    except BrokenProcessPool:
+        reset_pool()
+        return process_comments(comments)
+
+atexit.register(reset_pool)
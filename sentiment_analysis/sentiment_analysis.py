@@ -1,5 +1,6 @@
 import re
 from collections import Counter
+from sentiment_analysis.indonesian_sentiment_lexicon import NEGATION_WORDS, CONTRAST_WORDS, INTENSIFIER_WORDS
 
 def load_words_from_txt(path):
     with open(path, 'r', encoding='utf-8') as file:
@@ -22,4 +23,118 @@ def analyze_sentiment(text):
     else:
         sentiment = "neutral"
 
-    return sentiment, pos_count, neg_count
\ No newline at end of file
+    return sentiment, pos_count, neg_count
+
+# the whole batch is tokenized in one pass, with this separator closing every text
+TEXT_SEPARATOR = "\x1e"
+TOKEN_RE = re.compile(r'\w+(?:-\w+)*|\x1e')
+
+NEGATION_SCOPE = 2
+# one word before a contrast word weighs exactly the margin, so "bagus, tapi" and a
+# one-against-one "bagus tapi kotor" stay neutral while two later words still win
+CONTRAST_DISCOUNT = 0.5
+NEUTRAL_MARGIN = 0.5
+
+def build_lexicon_map(positive_words, negative_words):
+    lexicon = {}
+    for word in positive_words:
+        lexicon[word] = 1
+    for word in negative_words:
+        lexicon[word] = 0 if lexicon.get(word) == 1 else -1
+    return {word: polarity for word, polarity in lexicon.items() if polarity}
+
+RAW_LEXICON_MAP = build_lexicon_map(POSITIVE_WORDS, NEGATIVE_WORDS)
+OPERATOR_WORDS = NEGATION_WORDS | CONTRAST_WORDS | INTENSIFIER_WORDS
+LEXICON_MAP = {word: polarity for word, polarity in RAW_LEXICON_MAP.items() if word not in OPERATOR_WORDS}
+
+PHRASE_LENGTHS = {}
+PHRASE_NEXT_WORDS = {}
+for phrase in LEXICON_MAP:
+    head, _, rest = phrase.partition(" ")
+    if rest:
+        PHRASE_LENGTHS[head] = max(PHRASE_LENGTHS.get(head, 1), len(rest.split()) + 1)
+        PHRASE_NEXT_WORDS.setdefault(head, set()).add(rest.split()[0])
+
+# one lookup per token: plain lexicon words map to their polarity, phrase heads,
+# negation/contrast words and the text separator map to 0 and take the slow path
+TOKEN_CODES = {
+    word: polarity for word, polarity in LEXICON_MAP.items()
+    if " " not in word and word not in PHRASE_LENGTHS
+}
+TOKEN_CODES.update((word, 0) for word in set(PHRASE_LENGTHS) | NEGATION_WORDS | CONTRAST_WORDS | {TEXT_SEPARATOR})
+# a negation word with nothing left to negate keeps its own polarity ("pelayanan kurang")
+NEGATION_POLARITY = {word: RAW_LEXICON_MAP.get(word, 0) for word in NEGATION_WORDS}
+NEGATION_STOPS = CONTRAST_WORDS | {TEXT_SEPARATOR}
+
+def tokenize_batch(texts):
+    texts = [text or "" for text in texts]
+    joined = TEXT_SEPARATOR.join(texts) + TEXT_SEPARATOR
+    if joined.count(TEXT_SEPARATOR) != len(texts):
+        joined = TEXT_SEPARATOR.join(text.replace(TEXT_SEPARATOR, " ") for text in texts) + TEXT_SEPARATOR
+    return TOKEN_RE.findall(joined.lower())
+
+def analyze_sentiment_batch(texts):
+    tokens = tokenize_batch(texts)
+    labels, positive_scores, negative_scores = [], [], []
+    code_for = TOKEN_CODES.get
+    pos_score = neg_score = 0.0
+    negated_until = -1
+    next_index = 0
+
+    for i, token in enumerate(tokens):
+        polarity = code_for(token)
+        if polarity is None or i < next_index:
+            continue
+
+        if not polarity:
+            if token == TEXT_SEPARATOR:
+                if pos_score - neg_score > NEUTRAL_MARGIN:
+                    labels.append("positive")
+                elif neg_score - pos_score > NEUTRAL_MARGIN:
+                    labels.append("negative")
+                else:
+                    labels.append("neutral")
+                # round() with ndigits is slow, and only scores discounted by a contrast word need it
+                positive_scores.append(pos_score if pos_score.is_integer() else round(pos_score, 2))
+                negative_scores.append(neg_score if neg_score.is_integer() else round(neg_score, 2))
+                pos_score = neg_score = 0.0
+                negated_until = -1
+                continue
+
+            if token in CONTRAST_WORDS:
+                pos_score *= CONTRAST_DISCOUNT
+                neg_score *= CONTRAST_DISCOUNT
+                negated_until = -1
+                continue
+
+            # every token is followed by at least the separator, so i + 1 is always valid
+            length = 1
+            if tokens[i + 1] in PHRASE_NEXT_WORDS.get(token, ()):
+                for n in range(PHRASE_LENGTHS[token], 1, -1):
+                    polarity = LEXICON_MAP.get(" ".join(tokens[i:i + n]), 0)
+                    if polarity:
+                        length = n
+                        break
+            if not polarity:
+                polarity = LEXICON_MAP.get(token, 0)
+            if not polarity:
+                if token not in NEGATION_WORDS:
+                    continue
+                if tokens[i + 1] not in NEGATION_STOPS:
+                    negated_until = i + NEGATION_SCOPE
+                    continue
+                polarity = NEGATION_POLARITY[token]
+                if not polarity:
+                    continue
+            next_index = i + length
+
+        if i <= negated_until:
+            polarity = -polarity
+            negated_until = -1
+
+        if polarity > 0:
+            pos_score += 1
+        else:
+            neg_score += 1
+
+    return labels, positive_scores, negative_scores
@@ -0,0 +1,60 @@
+import numpy as np  # type: ignore
+from utils.metrics import (REVENUE_METRICS, dense_matrix, dense_cube, safe_ratio, round_values, growth_pct,
+                           moving_average, first_index, sentiment_indices, compute_metrics)
+
+def test_safe_ratio_returns_zero_for_zero_denominator():
+    assert safe_ratio([1, 2, 3], [2, 0, 4], 100).tolist() == [50.0, 0.0, 75.0]
+
+def test_round_values_handles_nested_lists():
+    assert round_values(np.array([[1.005, 2.0], [3.14159, 0.0]])) == [[1.0, 2.0], [3.14, 0.0]]
+    assert round_values(2.345678) == 2.35
+
+def test_dense_matrix_fills_missing_keys_with_zero():
+    matrix = dense_matrix({"b": {"x": 2, "y": None}, "z": {"x": 9}}, ["a", "b"], ("x", "y"))
+    assert matrix.tolist() == [[0.0, 2.0], [0.0, 0.0]]
+
+def test_dense_cube_stacks_groups():
+    cube = dense_cube({("g1", "a"): {"x": 1}, ("g2", "b"): {"x": 2}}, ["g1", "g2"], ["a", "b"], ("x",))
+    assert cube.shape == (2, 1, 2)
+    assert cube.tolist() == [[[1.0, 0.0]], [[0.0, 2.0]]]
+    assert dense_cube({}, [], ["a"], ("x",)).shape == (0, 1, 1)
+
+def test_growth_pct_compares_last_two_periods():
+    assert growth_pct([100, 50, 75]).item() == 50.0
+    assert growth_pct([0, 10]).item() == 0.0
+    assert growth_pct([10]).item() == 0.0
+
+def test_moving_average_uses_partial_windows_at_start():
+    assert moving_average([3, 6, 9, 12], window=3).tolist() == [3.0, 4.5, 6.0, 9.0]
+
+def test_first_index_respects_mask():
+    values = np.array([0.0, 5.0, 2.0])
+    assert first_index(values) == 1
+    assert first_index(values, np.argmin, mask=values > 0) == 2
+    assert first_index(values, np.argmin, mask=np.zeros(3, dtype=bool)) == 0
+    assert first_index([]) == 0
+
+def test_sentiment_indices_default_to_neutral_without_reviews():
+    sentiment = np.array([[4.0, 0.0], [2.0, 0.0], [1.0, 0.0], [1.0, 0.0]])
+    indices = sentiment_indices(sentiment)
+    assert indices["sentiment_score"].tolist() == [62.5, 0.0]
+    assert indices["composite_sentiment_index"].tolist() == [68.75, 50.0]
+
+def test_compute_metrics_summary():
+    revenue = np.zeros((len(REVENUE_METRICS), 3))
+    revenue[REVENUE_METRICS.index("grand_total_revenue")] = [0, 200, 100]
+    revenue[REVENUE_METRICS.index("gross_revenue")] = [0, 200, 100]
+    revenue[REVENUE_METRICS.index("room_revenue")] = [0, 150, 50]
+    sentiment = np.array([[0, 2, 1], [0, 2, 0], [0, 0, 1], [0, 0, 0]])
+
+    series, summary, growth, moving_averages = compute_metrics(revenue, sentiment, ["Jan", "Feb", "Mar"])
+
+    assert series["room_revenue_ratio"].tolist() == [0.0, 75.0, 50.0]
+    assert summary["total_revenue"] == 300.0
+    assert summary["active_revenue_months"] == 2
+    assert summary["avg_monthly_revenue"] == 150.0
+    assert summary["best_month"] == {"month": "Feb", "revenue": 200.0}
+    assert summary["worst_month"] == {"month": "Mar", "revenue": 100.0}
+    assert summary["positive_negative_ratio"] == 2.0
+    assert growth["revenue_growth_pct"] == -50.0
+    assert moving_averages["grand_total_revenue"] == [0.0, 100.0, 100.0]
@@ -0,0 +1,52 @@
+from datetime import datetime
+import pytest  # type: ignore
+from bson import ObjectId  # type: ignore
+from utils.pagination import encode_cursor, decode_cursor, keyset_match, next_cursor
+
+def test_cursor_round_trips_value_and_id():
+    last_id = ObjectId()
+    day = datetime(2024, 6, 1)
+    token = encode_cursor("revenue_date", -1, day, last_id)
+    assert "=" not in token
+    assert decode_cursor(token, "revenue_date", -1) == (day, last_id)
+
+def test_cursor_rejects_other_sort_field():
+    token = encode_cursor("revenue_date", -1, datetime(2024, 6, 1), ObjectId())
+    with pytest.raises(ValueError):
+        decode_cursor(token, "grand_total_revenue", -1)
+
+def test_cursor_rejects_other_sort_direction():
+    token = encode_cursor("revenue_date", 1, datetime(2024, 6, 1), ObjectId())
+    with pytest.raises(ValueError):
+        keyset_match("revenue_date", -1, token)
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor", "revenue_date", -1)
+
+def test_keyset_match_uses_sort_direction():
+    last_id = ObjectId()
+    descending = keyset_match("timestamp", -1, encode_cursor("timestamp", -1, 5, last_id))
+    assert descending == {"$or": [
+        {"timestamp": {"$lt": 5}}, {"timestamp": None}, {"timestamp": 5, "_id": {"$lt": last_id}}
+    ]}
+    ascending = keyset_match("timestamp", 1, encode_cursor("timestamp", 1, 5, last_id))
+    assert ascending == {"$or": [{"timestamp": {"$gt": 5}}, {"timestamp": 5, "_id": {"$gt": last_id}}]}
+
+def test_keyset_match_handles_null_sort_values():
+    last_id = ObjectId()
+    ascending = keyset_match("timestamp", 1, encode_cursor("timestamp", 1, None, last_id))
+    assert ascending == {"$or": [{"timestamp": {"$ne": None}}, {"timestamp": None, "_id": {"$gt": last_id}}]}
+    descending = keyset_match("timestamp", -1, encode_cursor("timestamp", -1, None, last_id))
+    assert descending == {"$or": [{"timestamp": None, "_id": {"$lt": last_id}}]}
+
+def test_next_cursor_points_at_last_item_of_page():
+    items = [{"_id": ObjectId(), "timestamp": i} for i in range(4)]
+    assert next_cursor(items, "timestamp", -1, 4) is None
+    token = next_cursor(items, "timestamp", -1, 3)
+    assert decode_cursor(token, "timestamp", -1) == (2, items[2]["_id"])
+
+def test_next_cursor_value_getter():
+    items = [{"_id": ObjectId(), "nested": {"total": i}} for i in range(3)]
+    token = next_cursor(items, "nested.total", 1, 2, value_getter=lambda item: item["nested"]["total"])
+    assert decode_cursor(token, "nested.total", 1) == (1, items[1]["_id"])
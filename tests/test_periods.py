@@ -0,0 +1,35 @@
+from datetime import datetime
+import pytest  # type: ignore
+from utils.periods import GRANULARITIES, truncate, next_bucket, bucket_starts, count_buckets, is_month_aligned, period_label
+
+def test_truncate():
+    day = datetime(2024, 8, 15, 13, 30)
+    assert truncate(day, "daily") == datetime(2024, 8, 15)
+    assert truncate(day, "weekly") == datetime(2024, 8, 12)
+    assert truncate(day, "monthly") == datetime(2024, 8, 1)
+    assert truncate(day, "quarterly") == datetime(2024, 7, 1)
+
+def test_next_bucket_rolls_over_year():
+    assert next_bucket(datetime(2024, 12, 1), "monthly") == datetime(2025, 1, 1)
+    assert next_bucket(datetime(2024, 10, 1), "quarterly") == datetime(2025, 1, 1)
+    assert next_bucket(datetime(2024, 12, 30), "weekly") == datetime(2025, 1, 6)
+
+def test_bucket_starts_cover_partial_first_bucket():
+    assert bucket_starts(datetime(2024, 2, 15), datetime(2024, 4, 1), "monthly") == [
+        datetime(2024, 2, 1), datetime(2024, 3, 1), datetime(2024, 4, 1)
+    ]
+
+@pytest.mark.parametrize("granularity", GRANULARITIES)
+def test_count_buckets_matches_bucket_starts(granularity):
+    start, end = datetime(2023, 11, 17), datetime(2024, 9, 3)
+    assert count_buckets(start, end, granularity) == len(bucket_starts(start, end, granularity))
+
+def test_is_month_aligned():
+    assert is_month_aligned(datetime(2024, 1, 1), datetime(2024, 2, 29))
+    assert not is_month_aligned(datetime(2024, 1, 1), datetime(2024, 2, 28))
+    assert not is_month_aligned(datetime(2024, 1, 2), datetime(2024, 1, 31))
+
+def test_period_label():
+    assert period_label(datetime(2024, 8, 1), "monthly") == "Aug 2024"
+    assert period_label(datetime(2024, 7, 1), "quarterly") == "Q3 2024"
+    assert period_label(datetime(2024, 8, 12), "weekly") == "12-08-2024"
@@ -0,0 +1,86 @@
+import copy
+import pytest  # type: ignore
+from controllers.revenue_controller import RevenueController
+from utils.rates import parse_rate_table, rates_for, rate_arrays
+from utils.revenue_engine import DERIVED_FIELDS, field_value, rate_expression, recompute_documents
+
+SAMPLES = [
+    {"date": "01-03-2024", "room_lodging": 1500000, "rebate_discount": 125000.5, "breakfast": 240000,
+     "restaurant_food": 310000.25, "restaurant_beverage": 99000, "telephone": 12000, "spa_therapy": 450000,
+     "allowance_other": 3000, "ap_restaurant": 15000, "tips": 20000,
+     "room_available": 40, "rooms_occupied": 27, "rooms_sold": 25},
+    {"date": "15-07-2024", "room_details": {"room_lodging": "980000.10"}, "other_revenue": {"misc": 77.77},
+     "room_stats": {"room_available": 0, "rooms_occupied": 0, "rooms_sold": 0}},
+    {"date": "31-12-2023", "room_lodging": 333.333, "rooms_sold": 3, "room_available": 7, "rooms_occupied": 3}
+]
+
+def calculate(data):
+    controller = RevenueController.__new__(RevenueController)
+    return {**controller.calculate_revenue(copy.deepcopy(data)), "date": data["date"]}
+
+@pytest.fixture
+def documents():
+    return [{"_id": i, **calculate(sample)} for i, sample in enumerate(SAMPLES)]
+
+def test_recompute_matches_calculate_revenue(documents):
+    scanned, updates = recompute_documents(documents)
+    assert scanned == len(SAMPLES)
+    assert updates == []
+
+def test_recompute_restores_stale_derived_fields(documents):
+    expected = copy.deepcopy(documents)
+    for doc in documents:
+        doc["grand_total_revenue"] = 0
+        doc["room_stats"]["occupancy"] = -1
+
+    _, updates = recompute_documents(documents)
+    assert [doc["_id"] for doc, _ in updates] == [0, 1, 2]
+    for (doc, fields), original in zip(updates, expected):
+        assert fields == {
+            "grand_total_revenue": original["grand_total_revenue"],
+            "room_stats.occupancy": original["room_stats"]["occupancy"]
+        }
+
+def strip_derived(doc):
+    doc = copy.deepcopy(doc)
+    for path in DERIVED_FIELDS.values():
+        parent = doc
+        for part in path[:-1]:
+            parent = parent[part]
+        parent.pop(path[-1])
+    return doc
+
+def test_recompute_writes_every_derived_field_for_bare_documents(documents):
+    _, updates = recompute_documents([strip_derived(doc) for doc in documents])
+    for (doc, fields), original in zip(updates, documents):
+        assert fields == {".".join(path): field_value(original, path) for path in DERIVED_FIELDS.values()}
+
+def test_recompute_skips_documents_without_inputs():
+    scanned, updates = recompute_documents([{"_id": 1, "date": "01-01-2024"}, {"_id": 2, "room_details": None}])
+    assert (scanned, updates) == (0, [])
+
+def test_recompute_uses_date_effective_rates(documents):
+    table = parse_rate_table([
+        {"effective_from": "01-01-1970", "service_charge": 0.10, "government_tax": 0.11},
+        {"effective_from": "01-04-2024", "service_charge": 0.05, "government_tax": 0.12}
+    ])
+    assert rates_for("31-03-2024", table) == (0.10, 0.11)
+    assert rates_for("01-04-2024", table) == (0.05, 0.12)
+    assert [rates.tolist() for rates in rate_arrays(["31-03-2024", "01-04-2024"], table)] == [[0.10, 0.05], [0.11, 0.12]]
+
+    _, updates = recompute_documents(documents, table)
+    changed = {doc["_id"]: fields for doc, fields in updates}
+    assert set(changed) == {1}
+    nett = documents[1]["nett_revenue"]
+    assert changed[1]["service_charge"] == round(nett * 0.05, 2)
+    assert changed[1]["government_tax"] == round(nett * 0.12, 2)
+
+def test_unparseable_dates_use_the_first_rate_entry():
+    table = parse_rate_table([
+        {"effective_from": "01-01-1970", "service_charge": 0.10, "government_tax": 0.11},
+        {"effective_from": "01-04-2024", "service_charge": 0.05, "government_tax": 0.12}
+    ])
+    assert rates_for("2024-04-01", table) == (0.10, 0.11)
+    assert rates_for(None, table) == (0.10, 0.11)
+    assert [rates.tolist() for rates in rate_arrays([None, "bad"], table)] == [[0.10, 0.10], [0.11, 0.11]]
+    assert rate_expression("government_tax", table)["$switch"]["default"] == 0.11
@@ -0,0 +1,39 @@
+from sentiment_analysis.sentiment_analysis import CONTRAST_DISCOUNT, analyze_sentiment_batch
+
+def score(text):
+    _, positive_scores, negative_scores = analyze_sentiment_batch([text])
+    return positive_scores[0], negative_scores[0]
+
+def label(text):
+    return analyze_sentiment_batch([text])[0][0]
+
+def test_plain_lexicon_words_are_counted():
+    assert score("kamar bersih") == (1, 0)
+    assert label("kamar bersih") == "positive"
+
+def test_trailing_negation_word_keeps_its_own_polarity():
+    assert score("pelayanan kurang") == (0, 1)
+    assert label("pelayanan kurang") == "negative"
+    assert label("tidak") == "negative"
+
+def test_negation_flips_the_word_it_targets():
+    assert score("tidak bagus") == (0, 1)
+    assert score("kurang bersih") == (0, 1)
+    assert label("tidak bagus") == "negative"
+
+def test_negation_before_contrast_word_keeps_its_own_polarity():
+    assert score("pelayanan kurang, tapi kamar bersih") == (1, CONTRAST_DISCOUNT)
+    assert label("pelayanan kurang, tapi kamar bersih dan nyaman") == "positive"
+
+def test_contrast_discounts_the_clause_before_it():
+    assert label("kamar bagus tapi kotor") == "neutral"
+    assert label("kamar bagus tapi kotor dan bau") == "negative"
+    assert label("kamar kotor tapi bersih dan nyaman") == "positive"
+
+def test_batch_texts_are_scored_independently():
+    texts = ["tidak", "bagus", "kamar kotor\x1etidak bersih", "kamar bersih"]
+    assert analyze_sentiment_batch(texts)[0] == ["negative", "positive", "negative", "positive"]
+
+def test_text_without_lexicon_words_is_neutral():
+    assert score("kamar di lantai tiga") == (0, 0)
+    assert analyze_sentiment_batch(["", None, "kamar di lantai tiga"]) == (["neutral"] * 3, [0, 0, 0], [0, 0, 0])
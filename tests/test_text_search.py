@@ -0,0 +1,51 @@
+import re
+from utils.text_search import (stem, tokenize, build_search_text, text_search_query, build_search_prefixes,
+                               prefix_search_query, prefix_rank_expression, MAX_PREFIX_LENGTH)
+
+def test_stem_strips_affixes():
+    assert stem("kebersihan") == "bersih"
+    assert stem("kenyamanan") == "nyaman"
+    assert stem("terbaik") == "baik"
+    assert stem("menginap") == "inap"
+    assert stem("kamarnya") == "kamar"
+
+def test_stem_keeps_short_ke_se_di_roots():
+    for word in ("kecil", "sehat", "kelas", "kereta", "senang", "sering", "kemarin", "selimut", "sedikit",
+                 "dingin", "diskon", "dinding"):
+        assert stem(word) == word
+
+def test_stem_still_strips_se_di_before_long_roots():
+    assert stem("sekamar") == "kamar"
+    assert stem("dibersihkan") == "bersih"
+
+def test_stem_leaves_non_alpha_tokens():
+    assert stem("a1b2") == "a1b2"
+
+def test_build_search_text_dedupes_terms():
+    assert build_search_text("Kamarnya bersih", None, "kamar BERSIH luas") == "kamar bersih luas"
+
+def test_text_search_query_quotes_terms():
+    assert text_search_query("kamar bersih") == {"$search": '"kamar" "bersih"'}
+    assert text_search_query("!!!") is None
+
+def test_tokenize_removes_zero_width_characters():
+    assert tokenize("ka\u200bmar") == ["kamar"]
+
+def test_build_search_prefixes_folds_accents():
+    prefixes = build_search_prefixes("Café", None)
+    assert prefixes == ["c", "ca", "caf", "cafe"]
+
+def test_build_search_prefixes_caps_length():
+    word = "a" * (MAX_PREFIX_LENGTH + 5)
+    assert max(len(prefix) for prefix in build_search_prefixes(word)) == MAX_PREFIX_LENGTH
+
+def test_prefix_search_query():
+    assert prefix_search_query("Grand Hy") == {"search_prefixes": {"$all": ["grand", "hy"]}}
+    assert prefix_search_query("-") is None
+
+def test_prefix_rank_matches_accented_names():
+    for search in ("cafe", "Café"):
+        starts_with = prefix_rank_expression(search)["$switch"]["branches"][0]["case"]["$regexMatch"]
+        assert re.search(starts_with["regex"], "Café Batavia", re.I)
+        assert re.search(starts_with["regex"], "cafe batavia", re.I)
+        assert not re.search(starts_with["regex"], "Grand Café", re.I)
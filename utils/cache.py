@@ -0,0 +1,70 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pymongo import UpdateOne  # type: ignore
+
+GLOBAL_VERSION_KEY = "all"
+
+class LRUCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class MongoCache:
+    def __init__(self, collection, ttl_seconds=3600):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key):
+        doc = self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        return doc["value"] if doc else None
+
+    def set(self, key, value):
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        self.collection.replace_one({"_id": key}, {"value": value, "expires_at": expires_at}, upsert=True)
+
+    def clear(self):
+        self.collection.delete_many({})
+
+class VersionCounters:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def bump(self, hotel_ids):
+        keys = {str(hid) for hid in hotel_ids if hid} | {GLOBAL_VERSION_KEY}
+        self.collection.bulk_write([
+            UpdateOne({"_id": key}, {"$inc": {"version": 1}}, upsert=True)
+            for key in sorted(keys)
+        ], ordered=False)
+
+    def current(self, hotel_ids=None):
+        keys = sorted({str(hid) for hid in hotel_ids}) if hotel_ids else [GLOBAL_VERSION_KEY]
+        found = {doc["_id"]: doc["version"] for doc in self.collection.find({"_id": {"$in": keys}})}
+        return [found.get(key, 0) for key in keys]
+
+def cache_key(prefix, *parts):
+    return ":".join([prefix] + [str(part) for part in parts])
+
+def make_etag(key, versions):
+    raw = f"{key}|{','.join(str(v) for v in versions)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
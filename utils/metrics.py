@@ -0,0 +1,167 @@
+import numpy as np  # type: ignore
+
+REVENUE_METRICS = ("room_revenue", "restaurant_revenue", "other_revenue",
+                   "nett_revenue", "gross_revenue", "grand_total_revenue")
+SENTIMENT_METRICS = ("total", "positive", "negative", "neutral")
+MOVING_AVERAGE_WINDOW = 3
+
+def dense_matrix(rows, keys, metrics, dtype=float):
+    matrix = np.zeros((len(metrics), len(keys)), dtype=dtype)
+    positions = {key: i for i, key in enumerate(keys)}
+    for key, row in rows.items():
+        i = positions.get(key)
+        if i is None:
+            continue
+        matrix[:, i] = [row.get(metric) or 0 for metric in metrics]
+    return matrix
+
+def dense_cube(rows, groups, keys, metrics, dtype=float):
+    by_group = {group: {} for group in groups}
+    for (group, key), row in rows.items():
+        if group in by_group:
+            by_group[group][key] = row
+    if not groups:
+        return np.zeros((0, len(metrics), len(keys)), dtype=dtype)
+    return np.stack([dense_matrix(by_group[group], keys, metrics, dtype) for group in groups])
+
+def round_values(values, ndigits=2):
+    values = values.tolist() if isinstance(values, np.ndarray) else values
+    if isinstance(values, list):
+        return [round_values(v, ndigits) for v in values]
+    return round(values, ndigits)
+
+def round_array(values, ndigits=2):
+    return np.array(round_values(values, ndigits), dtype=float)
+
+def safe_ratio(numerator, denominator, scale=1.0):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out * scale
+
+def revenue_ratios(revenue):
+    room, restaurant, other, gross = (revenue[REVENUE_METRICS.index(k)] for k in
+                                      ("room_revenue", "restaurant_revenue", "other_revenue", "gross_revenue"))
+    return {
+        "room_revenue_ratio": safe_ratio(room, gross, 100),
+        "restaurant_revenue_ratio": safe_ratio(restaurant, gross, 100),
+        "other_revenue_ratio": safe_ratio(other, gross, 100)
+    }
+
+def sentiment_indices(sentiment):
+    total, pos, neg, neu = sentiment
+    pos_share = safe_ratio(pos, total)
+    neg_share = safe_ratio(neg, total)
+    neu_share = safe_ratio(neu, total)
+
+    wsi = safe_ratio(pos * 1 + neu * 0.5, total)
+    csi = pos_share * 1.0 + neu_share * 0.5 - neg_share * 1.0
+    composite = np.where(total != 0, ((csi + 1) / 2) * 100, 50.0)
+
+    return {
+        "sentiment_score": wsi * 100,
+        "composite_sentiment_index": composite,
+        "positive_ratio": pos_share,
+        "negative_ratio": neg_share,
+        "neutral_ratio": neu_share
+    }
+
+def growth_pct(series):
+    series = np.asarray(series, dtype=float)
+    if series.shape[-1] < 2:
+        return np.zeros(series.shape[:-1])
+    current, previous = series[..., -1], series[..., -2]
+    growth = safe_ratio(current - previous, previous, 100)
+    return round_array(growth)
+
+def moving_average(series, window=MOVING_AVERAGE_WINDOW):
+    series = np.asarray(series, dtype=float)
+    cumulative = np.cumsum(series, axis=-1)
+    shifted = np.zeros_like(cumulative)
+    shifted[..., window:] = cumulative[..., :-window]
+    counts = np.minimum(np.arange(1, series.shape[-1] + 1), window)
+    return (cumulative - shifted) / counts
+
+def first_index(values, pick=np.argmax, mask=None):
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return 0
+    if mask is not None:
+        if not mask.any():
+            return 0
+        fill = np.inf if pick is np.argmin else -np.inf
+        values = np.where(mask, values, fill)
+    return int(pick(values))
+
+def summarize(series, labels):
+    grand_totals = series["grand_total_revenue"]
+    sentiment_scores = series["sentiment_score"]
+    review_volumes = series["review_volume"]
+    periods = len(labels)
+
+    def at(values, idx):
+        return values[idx].item()
+
+    total_revenue = round(float(grand_totals.sum()), 2)
+    active = grand_totals > 0
+    active_months = int(active.sum())
+    total_reviews = int(review_volumes.sum())
+    total_pos = int(series["positive_sentiment"].sum())
+    total_neg = int(series["negative_sentiment"].sum())
+    total_neu = int(series["neutral_sentiment"].sum())
+
+    best_idx = first_index(grand_totals)
+    worst_idx = first_index(grand_totals, np.argmin, mask=active)
+    best_sent_idx = first_index(sentiment_scores)
+    worst_sent_idx = first_index(sentiment_scores, np.argmin)
+    peak_review_idx = first_index(review_volumes)
+
+    return {
+        "total_revenue": total_revenue,
+        "avg_monthly_revenue": round(total_revenue / active_months, 2) if active_months else 0,
+        "active_revenue_months": active_months,
+        "total_reviews": total_reviews,
+        "avg_review_volume": round(total_reviews / periods, 2),
+        "latest_sentiment_score": at(sentiment_scores, -1),
+        "avg_sentiment_score": round(float(sentiment_scores.mean()), 2),
+        "positive_negative_ratio": round(total_pos / total_neg, 2) if total_neg else total_pos,
+        "total_positive_sentiment": total_pos,
+        "total_negative_sentiment": total_neg,
+        "total_neutral_sentiment": total_neu,
+        "best_month": {"month": labels[best_idx], "revenue": at(grand_totals, best_idx)},
+        "worst_month": {"month": labels[worst_idx], "revenue": at(grand_totals, worst_idx)},
+        "best_sentiment_month": {"month": labels[best_sent_idx], "score": at(sentiment_scores, best_sent_idx)},
+        "worst_sentiment_month": {"month": labels[worst_sent_idx], "score": at(sentiment_scores, worst_sent_idx)},
+        "peak_review_month": {"month": labels[peak_review_idx], "reviews": at(review_volumes, peak_review_idx)},
+    }
+
+def compute_series(revenue, sentiment):
+    revenue = round_array(revenue)
+    series = dict(zip(REVENUE_METRICS, revenue))
+    series.update({key: round_array(values) for key, values in revenue_ratios(revenue).items()})
+    series.update({key: round_array(values) for key, values in sentiment_indices(sentiment).items()})
+
+    total, pos, neg, neu = sentiment
+    series["positive_sentiment"] = pos
+    series["negative_sentiment"] = neg
+    series["neutral_sentiment"] = neu
+    series["review_volume"] = total
+    return series
+
+def compute_metrics(revenue, sentiment, labels):
+    series = compute_series(revenue, sentiment)
+    summary = summarize(series, labels)
+    growth = {
+        "revenue_growth_pct": growth_pct(series["grand_total_revenue"]).item(),
+        "reviews_growth_pct": growth_pct(series["review_volume"]).item(),
+        "sentiment_growth_pct": growth_pct(series["sentiment_score"]).item()
+    }
+    moving_averages = {
+        "window": MOVING_AVERAGE_WINDOW,
+        **{
+            key: round_values(moving_average(series[key]))
+            for key in ("grand_total_revenue", "sentiment_score", "review_volume")
+        }
+    }
+    return series, summary, growth, moving_averages
@@ -0,0 +1,34 @@
+import base64
+from bson import json_util  # type: ignore
+
+def encode_cursor(sort_field, sort_order, value, last_id):
+    raw = json_util.dumps({"k": sort_field, "d": sort_order, "v": value, "id": last_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(token, sort_field, sort_order):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(data, dict) or data.get("k") != sort_field or data.get("d") != sort_order or "id" not in data:
+        raise ValueError("Cursor does not match the requested sort")
+    return data.get("v"), data["id"]
+
+def keyset_match(sort_field, sort_order, token):
+    value, last_id = decode_cursor(token, sort_field, sort_order)
+    op = "$lt" if sort_order < 0 else "$gt"
+    # null and missing values sort before everything else, and {"$gt": None} matches nothing
+    if value is None:
+        after = [{sort_field: {"$ne": None}}] if sort_order > 0 else []
+    else:
+        after = [{sort_field: {op: value}}] + ([{sort_field: None}] if sort_order < 0 else [])
+    return {"$or": after + [{sort_field: value, "_id": {op: last_id}}]}
+
+def next_cursor(items, sort_field, sort_order, limit, value_getter=None):
+    if len(items) <= limit:
+        return None
+    last = items[limit - 1]
+    value = value_getter(last) if value_getter else last.get(sort_field)
+    return encode_cursor(sort_field, sort_order, value, last["_id"])
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+GRANULARITIES = ("daily", "weekly", "monthly", "quarterly")
+TRUNCATE_UNITS = {"daily": "day", "weekly": "week", "monthly": "month", "quarterly": "quarter"}
+
+def truncate(day, granularity):
+    day = datetime(day.year, day.month, day.day)
+    if granularity == "weekly":
+        return day - timedelta(days=day.weekday())
+    if granularity == "monthly":
+        return day.replace(day=1)
+    if granularity == "quarterly":
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    return day
+
+def next_bucket(start, granularity):
+    if granularity == "daily":
+        return start + timedelta(days=1)
+    if granularity == "weekly":
+        return start + timedelta(days=7)
+    months = 3 if granularity == "quarterly" else 1
+    month = start.month - 1 + months
+    return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+
+def bucket_starts(start, end, granularity):
+    buckets = []
+    current = truncate(start, granularity)
+    while current <= end:
+        buckets.append(current)
+        current = next_bucket(current, granularity)
+    return buckets
+
+def count_buckets(start, end, granularity):
+    start = truncate(start, granularity)
+    if granularity == "daily":
+        return (end - start).days + 1
+    if granularity == "weekly":
+        return (end - start).days // 7 + 1
+    months = (end.year - start.year) * 12 + end.month - start.month
+    return months // (3 if granularity == "quarterly" else 1) + 1
+
+def is_month_aligned(start, end):
+    return start.day == 1 and next_bucket(truncate(end, "monthly"), "monthly") - timedelta(days=1) == end
+
+def period_label(start, granularity):
+    if granularity == "monthly":
+        return start.strftime("%b %Y")
+    if granularity == "quarterly":
+        return f"Q{(start.month - 1) // 3 + 1} {start.year}"
+    return start.strftime("%d-%m-%Y")
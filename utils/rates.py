@@ -0,0 +1,60 @@
+import hashlib
+import json
+from datetime import datetime
+import numpy as np  # type: ignore
+from config import REVENUE_RATE_TABLE
+
+RATE_DATE_FORMAT = "%d-%m-%Y"
+
+def parse_rate_table(raw):
+    entries = json.loads(raw) if isinstance(raw, str) else raw
+    if not entries:
+        raise ValueError("Rate table must have at least one entry")
+
+    table = []
+    for entry in entries:
+        table.append({
+            "effective_from": datetime.strptime(entry["effective_from"], RATE_DATE_FORMAT),
+            "service_charge": float(entry["service_charge"]),
+            "government_tax": float(entry["government_tax"])
+        })
+    return sorted(table, key=lambda entry: entry["effective_from"])
+
+def rate_table_signature(table):
+    payload = json.dumps([
+        [entry["effective_from"].strftime(RATE_DATE_FORMAT), entry["service_charge"], entry["government_tax"]]
+        for entry in table
+    ])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+# dates that do not parse get the first table entry, so a recompute never depends on today
+def date_ordinal(value, default):
+    if isinstance(value, str):
+        try:
+            value = datetime.strptime(value, RATE_DATE_FORMAT)
+        except ValueError:
+            value = None
+    if not isinstance(value, datetime):
+        return default
+    return value.toordinal()
+
+def rates_for(date, table=None):
+    table = table or RATE_TABLE
+    ordinal = date_ordinal(date, table[0]["effective_from"].toordinal())
+    current = table[0]
+    for entry in table:
+        if entry["effective_from"].toordinal() > ordinal:
+            break
+        current = entry
+    return current["service_charge"], current["government_tax"]
+
+def rate_arrays(dates, table=None):
+    table = table or RATE_TABLE
+    effective = np.array([entry["effective_from"].toordinal() for entry in table])
+    ordinals = np.array([date_ordinal(date, effective[0]) for date in dates], dtype=np.int64)
+    idx = np.clip(np.searchsorted(effective, ordinals, side="right") - 1, 0, None)
+    service = np.array([entry["service_charge"] for entry in table])
+    tax = np.array([entry["government_tax"] for entry in table])
+    return service[idx], tax[idx]
+
+RATE_TABLE = parse_rate_table(REVENUE_RATE_TABLE)
@@ -0,0 +1,217 @@
+import numpy as np  # type: ignore
+from utils.metrics import safe_ratio, round_array
+from utils.rates import RATE_TABLE, rate_arrays
+
+FLOAT_INPUTS = {
+    "room_lodging": ("room_details", "room_lodging"),
+    "rebate_discount": ("room_details", "rebate_discount"),
+    "breakfast": ("restaurant", "breakfast"),
+    "restaurant_food": ("restaurant", "restaurant_food"),
+    "restaurant_beverage": ("restaurant", "restaurant_beverage"),
+    "other_room_revenue": ("other_revenue", "other_room_revenue"),
+    "telephone": ("other_revenue", "telephone"),
+    "business_center": ("other_revenue", "business_center"),
+    "other_income": ("other_revenue", "other_income"),
+    "spa_therapy": ("other_revenue", "spa_therapy"),
+    "misc": ("other_revenue", "misc"),
+    "allowance_other": ("other_revenue", "allowance_other"),
+    "ap_restaurant": ("ap_restaurant",),
+    "tips": ("tips",)
+}
+INT_INPUTS = {
+    "room_available": ("room_stats", "room_available"),
+    "rooms_occupied": ("room_stats", "rooms_occupied"),
+    "rooms_sold": ("room_stats", "rooms_sold")
+}
+PASSTHROUGH_INT_INPUTS = {
+    "active_rooms": ("room_stats", "active_rooms"),
+    "house_use": ("room_stats", "house_use"),
+    "complimentary": ("room_stats", "complimentary"),
+    "guests_in_house": ("room_stats", "guests_in_house")
+}
+STORED_INPUTS = {**FLOAT_INPUTS, **INT_INPUTS, **PASSTHROUGH_INT_INPUTS}
+DERIVED_FIELDS = {
+    "total_room_revenue": ("room_details", "total_room_revenue"),
+    "total_restaurant_revenue": ("restaurant", "total_restaurant_revenue"),
+    "total_other_revenue": ("other_revenue", "total_other_revenue"),
+    "nett_revenue": ("nett_revenue",),
+    "service_charge": ("service_charge",),
+    "government_tax": ("government_tax",),
+    "gross_revenue": ("gross_revenue",),
+    "grand_total_revenue": ("grand_total_revenue",),
+    "vacant_rooms": ("room_stats", "vacant_rooms"),
+    "occupancy": ("room_stats", "occupancy"),
+    "average_room_rate": ("room_stats", "average_room_rate")
+}
+INT_DERIVED = ("vacant_rooms",)
+
+def field_value(doc, path):
+    value = doc
+    for part in path:
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+def is_recomputable(doc):
+    return isinstance(doc.get("room_details"), dict) and "room_lodging" in doc["room_details"]
+
+def load_columns(docs):
+    rows = []
+    for doc in docs:
+        if not is_recomputable(doc):
+            continue
+        try:
+            floats = [float(field_value(doc, path) or 0) for path in FLOAT_INPUTS.values()]
+            ints = [int(field_value(doc, path) or 0) for path in INT_INPUTS.values()]
+        except (TypeError, ValueError):
+            continue
+        rows.append((doc, floats, ints))
+
+    kept = [doc for doc, _, _ in rows]
+    columns = {}
+    float_matrix = np.array([floats for _, floats, _ in rows], dtype=float).reshape(len(rows), len(FLOAT_INPUTS))
+    int_matrix = np.array([ints for _, _, ints in rows], dtype=np.int64).reshape(len(rows), len(INT_INPUTS))
+    columns.update(zip(FLOAT_INPUTS, float_matrix.T))
+    columns.update(zip(INT_INPUTS, int_matrix.T))
+    return kept, columns
+
+def stored_columns(docs):
+    columns = {}
+    for key, path in DERIVED_FIELDS.items():
+        values = [field_value(doc, path) for doc in docs]
+        columns[key] = np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=float)
+    return columns
+
+def compute_revenue_columns(columns, service_charge_rate, government_tax_rate):
+    c = columns
+    total_room = c["room_lodging"] - c["rebate_discount"]
+    total_restaurant = c["breakfast"] + c["restaurant_food"] + c["restaurant_beverage"]
+    total_other = (
+        c["other_room_revenue"] + c["telephone"] + c["business_center"] +
+        c["other_income"] + c["spa_therapy"] + c["misc"] - c["allowance_other"]
+    )
+
+    nett = total_room + total_restaurant + total_other
+    service_charge = nett * service_charge_rate
+    government_tax = nett * government_tax_rate
+    gross = nett + service_charge + government_tax
+    grand_total = gross + c["ap_restaurant"] + c["tips"]
+
+    available = c["room_available"]
+    occupied = c["rooms_occupied"]
+    vacant = np.where(available > 0, available - occupied, 0)
+    occupancy = safe_ratio(occupied, np.where(available > 0, available, 0), 100)
+    average_room_rate = safe_ratio(total_room, np.where(c["rooms_sold"] > 0, c["rooms_sold"], 0))
+
+    return {
+        "total_room_revenue": round_array(total_room),
+        "total_restaurant_revenue": round_array(total_restaurant),
+        "total_other_revenue": round_array(total_other),
+        "nett_revenue": round_array(nett),
+        "service_charge": round_array(service_charge),
+        "government_tax": round_array(government_tax),
+        "gross_revenue": round_array(gross),
+        "grand_total_revenue": round_array(grand_total),
+        "vacant_rooms": vacant,
+        "occupancy": round_array(occupancy),
+        "average_room_rate": round_array(average_room_rate)
+    }
+
+def recompute_documents(docs, table=None):
+    docs, columns = load_columns(docs)
+    service_rate, tax_rate = rate_arrays([doc.get("date") for doc in docs], table)
+    derived = compute_revenue_columns(columns, service_rate, tax_rate)
+    stored = stored_columns(docs)
+
+    changed_fields = {key: derived[key] != stored[key] for key in DERIVED_FIELDS}
+    changed_rows = np.flatnonzero(np.any(np.stack(list(changed_fields.values())), axis=0)) if docs else []
+
+    values = {key: column.tolist() for key, column in derived.items()}
+    updates = []
+    for i in changed_rows:
+        fields = {
+            ".".join(DERIVED_FIELDS[key]): int(values[key][i]) if key in INT_DERIVED else values[key][i]
+            for key, mask in changed_fields.items() if mask[i]
+        }
+        updates.append((docs[i], fields))
+    return len(docs), updates
+
+def path_ref(key):
+    return "$" + ".".join(STORED_INPUTS[key])
+
+def add_expression(*values):
+    total = values[0]
+    for value in values[1:]:
+        total = {"$add": [total, value]}
+    return total
+
+def ratio_expression(numerator, denominator, scale=None):
+    value = {"$divide": [numerator, denominator]}
+    if scale is not None:
+        value = {"$multiply": [value, scale]}
+    return {"$cond": [{"$gt": [denominator, 0]}, value, 0]}
+
+def rate_expression(rate_key, table=None):
+    table = table or RATE_TABLE
+    return {
+        "$switch": {
+            "branches": [
+                {"case": {"$gte": ["$revenue_date", entry["effective_from"]]}, "then": entry[rate_key]}
+                for entry in reversed(table)
+            ],
+            "default": table[0][rate_key]
+        }
+    }
+
+def recompute_update_pipeline(changes, table=None):
+    calc = lambda key: f"$_recompute.{key}"
+    return [
+        {"$set": {path: {"$literal": value} for path, value in changes.items()}},
+        {"$set": {"revenue_date": {"$ifNull": ["$revenue_date", {
+            "$dateFromString": {"dateString": "$date", "format": "%d-%m-%Y", "onError": None, "onNull": None}
+        }]}}},
+        {"$set": {
+            ".".join(path): {"$convert": {
+                "input": "$" + ".".join(path),
+                "to": "double" if key in FLOAT_INPUTS else "int",
+                "onError": 0,
+                "onNull": 0
+            }}
+            for key, path in STORED_INPUTS.items()
+        }},
+        {"$set": {"_recompute": {
+            "total_room_revenue": {"$subtract": [path_ref("room_lodging"), path_ref("rebate_discount")]},
+            "total_restaurant_revenue": add_expression(
+                path_ref("breakfast"), path_ref("restaurant_food"), path_ref("restaurant_beverage")),
+            "total_other_revenue": {"$subtract": [add_expression(
+                path_ref("other_room_revenue"), path_ref("telephone"), path_ref("business_center"),
+                path_ref("other_income"), path_ref("spa_therapy"), path_ref("misc")), path_ref("allowance_other")]},
+            "service_charge_rate": rate_expression("service_charge", table),
+            "government_tax_rate": rate_expression("government_tax", table)
+        }}},
+        {"$set": {"_recompute.nett_revenue": add_expression(
+            calc("total_room_revenue"), calc("total_restaurant_revenue"), calc("total_other_revenue"))}},
+        {"$set": {
+            "_recompute.service_charge": {"$multiply": [calc("nett_revenue"), calc("service_charge_rate")]},
+            "_recompute.government_tax": {"$multiply": [calc("nett_revenue"), calc("government_tax_rate")]}
+        }},
+        {"$set": {"_recompute.gross_revenue": add_expression(
+            calc("nett_revenue"), calc("service_charge"), calc("government_tax"))}},
+        {"$set": {
+            "_recompute.grand_total_revenue": add_expression(
+                calc("gross_revenue"), path_ref("ap_restaurant"), path_ref("tips")),
+            "_recompute.occupancy": ratio_expression(path_ref("rooms_occupied"), path_ref("room_available"), 100),
+            "_recompute.average_room_rate": ratio_expression(calc("total_room_revenue"), path_ref("rooms_sold"))
+        }},
+        {"$set": {
+            **{
+                ".".join(DERIVED_FIELDS[key]): {"$round": [calc(key), 2]}
+                for key in DERIVED_FIELDS if key != "vacant_rooms"
+            },
+            "room_stats.vacant_rooms": {"$cond": [
+                {"$gt": [path_ref("room_available"), 0]},
+                {"$subtract": [path_ref("room_available"), path_ref("rooms_occupied")]},
+                0
+            ]}
+        }},
+        {"$unset": "_recompute"}
+    ]
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import datetime
+from bson import ObjectId  # type: ignore
+from flask import Response, stream_with_context  # type: ignore
+from config import EXPORT_BATCH_SIZE
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+CSV_MIMETYPES = ("text/csv", "application/csv")
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def iter_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+def iter_csv(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for row in csv.DictReader(text):
+        yield {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+
+def iter_batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def export_value(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: export_value(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [export_value(v) for v in value]
+    return value
+
+def column_value(doc, column):
+    value = doc
+    for part in column.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return "" if value is None else export_value(value)
+
+def csv_chunks(docs, columns, size=EXPORT_BATCH_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in iter_batches(docs, size):
+        writer.writerows([column_value(doc, column) for column in columns] for doc in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def ndjson_chunks(docs, size=EXPORT_BATCH_SIZE):
+    for batch in iter_batches(docs, size):
+        yield "".join(json.dumps(export_value(doc), ensure_ascii=False) + "\n" for doc in batch)
+
+def export_response(docs, columns, fmt, filename):
+    chunks = csv_chunks(docs, columns) if fmt == "csv" else ndjson_chunks(docs)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
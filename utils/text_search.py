@@ -0,0 +1,127 @@
+import re
+import unicodedata
+
+ZERO_WIDTH_RE = re.compile('[\u200B-\u200D\uFEFF]')
+TOKEN_RE = re.compile(r'\w+')
+
+PARTICLES = ("lah", "kah", "tah", "pun")
+POSSESSIVES = ("nya", "ku", "mu")
+SUFFIXES = ("kan", "an", "i")
+PREFIXES = ("meng", "meny", "mem", "men", "me", "peng", "peny", "pem", "pen", "per", "pe",
+            "ber", "ter", "di", "ke", "se")
+NASAL_RECODING = {"meny": "s", "mem": "p", "men": "t", "peny": "s", "pem": "p", "pen": "t"}
+VOWELS = "aiueo"
+MIN_STEM_LENGTH = 4
+# "ke"/"se"/"di" start many roots (kereta, senang, dingin), so they need a longer remaining stem
+SHORT_PREFIXES = ("ke", "se", "di")
+MIN_SHORT_PREFIX_STEM_LENGTH = 5
+PREFIX_EXCEPTIONS = {
+    "kemarin", "keluarga", "kerupuk", "sedikit", "sekarang", "selamat", "selatan", "selimut",
+    "semangat", "sebentar", "dinding", "disiplin", "dispenser", "digital", "dinamis", "direktur"
+}
+MAX_PREFIX_LENGTH = 15
+HOTEL_SEARCH_FIELDS = ("hotel_name", "city", "country", "address")
+
+def strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+def strip_prefix(word):
+    if word in PREFIX_EXCEPTIONS:
+        return word
+    for prefix in PREFIXES:
+        if not word.startswith(prefix):
+            continue
+        stem = word[len(prefix):]
+        if prefix in NASAL_RECODING and stem[:1] in VOWELS:
+            stem = NASAL_RECODING[prefix] + stem
+        min_length = MIN_SHORT_PREFIX_STEM_LENGTH if prefix in SHORT_PREFIXES else MIN_STEM_LENGTH
+        if len(stem) >= min_length:
+            return stem
+    return word
+
+def stem(word):
+    if not word.isalpha():
+        return word
+    word = strip_suffix(word, PARTICLES)
+    word = strip_suffix(word, POSSESSIVES)
+    word = strip_suffix(word, SUFFIXES)
+    for _ in range(2):
+        stripped = strip_prefix(word)
+        if stripped == word:
+            break
+        word = stripped
+    return word
+
+def tokenize(text):
+    text = ZERO_WIDTH_RE.sub("", text or "").lower()
+    return [stem(token) for token in TOKEN_RE.findall(text)]
+
+def build_search_text(*fields):
+    terms = []
+    seen = set()
+    for field in fields:
+        for term in tokenize(field if isinstance(field, str) else ""):
+            if term not in seen:
+                seen.add(term)
+                terms.append(term)
+    return " ".join(terms)
+
+def text_search_query(search):
+    terms = list(dict.fromkeys(tokenize(search)))
+    if not terms:
+        return None
+    return {"$search": " ".join(f'"{term}"' for term in terms)}
+
+def fold_accents(text):
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+def prefix_tokens(text):
+    return TOKEN_RE.findall(fold_accents(ZERO_WIDTH_RE.sub("", text or "").lower()))
+
+# accented Latin letters by the letter they fold to, so a folded term can match the raw name
+ACCENTED_LETTERS = {}
+for code in range(0xC0, 0x250):
+    folded = fold_accents(chr(code)).lower()
+    if len(folded) == 1 and folded != chr(code).lower():
+        ACCENTED_LETTERS[folded] = ACCENTED_LETTERS.get(folded, "") + chr(code)
+
+def accent_pattern(term):
+    return "".join(
+        f"[{ch}{ACCENTED_LETTERS[ch]}]" if ch in ACCENTED_LETTERS else re.escape(ch)
+        for ch in term
+    )
+
+def build_search_prefixes(*fields):
+    prefixes = set()
+    for field in fields:
+        for token in prefix_tokens(field if isinstance(field, str) else ""):
+            prefixes.update(token[:i] for i in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1))
+    return sorted(prefixes)
+
+def hotel_search_prefixes(hotel):
+    return build_search_prefixes(*(hotel.get(field) for field in HOTEL_SEARCH_FIELDS))
+
+def prefix_search_query(search):
+    terms = list(dict.fromkeys(token[:MAX_PREFIX_LENGTH] for token in prefix_tokens(search)))
+    if not terms:
+        return None
+    return {"search_prefixes": {"$all": terms}}
+
+def prefix_rank_expression(search, field="$hotel_name"):
+    terms = [accent_pattern(term) for term in prefix_tokens(search)]
+    if not terms:
+        return 2
+    return {"$switch": {
+        "branches": [
+            {"case": {"$regexMatch": {"input": field, "regex": r"^\W*" + r"\W+".join(terms), "options": "i"}},
+             "then": 0},
+            {"case": {"$and": [
+                {"$regexMatch": {"input": field, "regex": r"(^|\W)" + term, "options": "i"}} for term in terms
+            ]}, "then": 1}
+        ],
+        "default": 2
+    }}